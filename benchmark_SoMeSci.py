@@ -0,0 +1,227 @@
+"""Benchmark the stages of the knowledge graph build on synthetic corpora.
+
+Generates corpora shaped like the SoMeSci submodule (brat .txt/.ann pairs in the
+four subset folders plus the Linking/*.json files) at multiples of the SoMeSci
+size and times each stage of the build separately:
+linking-table load, annotation parsing, triple generation and JSON-LD serialization.
+
+    python3 benchmark_SoMeSci.py --scales 1 10 100
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from somesci_kg import brat, convert, linking, mappings, metadata
+from somesci_kg.diagnostics import sink
+from somesci_kg.writers import write_jsonld
+
+
+# documents and sentences per document of each subset at scale 1, roughly the
+# composition of SoMeSci (1367 documents)
+subsets = {
+    'PLoS_sentences' : (metadata.sentences_dataset, 760, 1),
+    'PLoS_methods' : (metadata.methods_dataset, 480, 40),
+    'Pubmed_fulltext' : (metadata.pubmed_dataset, 100, 200),
+    'Creation_sentences' : (metadata.creation_dataset, 27, 1),
+}
+
+# software mentions per sentence, single sentence subsets were sampled for containing mentions
+mention_rate = {
+    'PLoS_sentences' : 1.5,
+    'PLoS_methods' : 0.1,
+    'Pubmed_fulltext' : 0.03,
+    'Creation_sentences' : 1.2,
+}
+
+# chance that a software mention comes with the additional information
+info_rate = {
+    'Version' : 0.4,
+    'Developer' : 0.25,
+    'Citation' : 0.2,
+    'URL' : 0.1,
+    'License' : 0.03,
+    'Abbreviation' : 0.05,
+}
+
+words = ("the of and in to was were using data analysis with for by as on performed "
+         "samples study results values statistical model test measured each from using "
+         "calculated all we software program version package data were analyzed").split()
+software_names = ["SPSS", "R", "MATLAB", "ImageJ", "Python", "GraphPad Prism", "Stata", "SAS",
+                  "BLAST", "lme4", "Excel", "Windows", "Linux", "ggplot2", "FlowJo", "Bioconductor"]
+developers = ["IBM", "MathWorks", "NIH", "Microsoft", "GraphPad Software", "StataCorp", "SAS Institute"]
+licenses = ["GPL", "MIT license", "BSD", "Apache License 2.0", "CC BY 4.0"]
+software_labels = ['Application_Usage'] * 12 + ['PlugIn_Usage'] * 3 + ['ProgrammingEnvironment_Usage'] * 3 + \
+    ['OperatingSystem_Usage', 'Application_Mention', 'Application_Creation', 'Application_Deposition', 'PlugIn_Creation']
+
+
+def info_string(label, rng):
+    if label == 'Version':
+        return "{}.{}".format(rng.randint(1, 25), rng.randint(0, 9))
+    if label == 'Developer':
+        return rng.choice(developers)
+    if label == 'Citation':
+        return "[{}]".format(rng.randint(1, 80))
+    if label == 'URL':
+        return "http://www.{}.org".format(rng.choice(words))
+    if label == 'License':
+        return rng.choice(licenses)
+    return rng.choice(software_names).upper()[:4]
+
+def synthetic_sentence(rng, n_mentions):
+    """Sentence text with its entities (label, beg, end, string) and relations (label, info, software)."""
+    text = ""
+    entities = []
+    relations = []
+
+    def append(string, label=None):
+        nonlocal text
+        if text:
+            text += " "
+        beg = len(text)
+        text += string
+        if label:
+            entities.append((label, beg, len(text), string))
+            return len(entities) - 1
+
+    for _ in range(rng.randint(4, 12)):
+        append(rng.choice(words))
+    for _ in range(n_mentions):
+        sw = append(rng.choice(software_names), rng.choice(software_labels))
+        for label, rate in info_rate.items():
+            if rng.random() < rate:
+                append(rng.choice(words))
+                info = append(info_string(label, rng), label)
+                relations.append(("{}_of".format(label), info, sw))
+        for _ in range(rng.randint(2, 8)):
+            append(rng.choice(words))
+    return text + ".", entities, relations
+
+def generate_corpus(folder, scale, seed=0):
+    """Write a synthetic SoMeSci-like corpus of the given scale to folder. Returns the number of documents."""
+    rng = random.Random(seed)
+    linking = {'artifacts.json' : [], 'developer.json' : [], 'license.json' : [], 'citations.json' : []}
+    n_docs = 0
+    for subset, (_, docs, sentences) in subsets.items():
+        os.makedirs(os.path.join(folder, subset), exist_ok=True)
+        for d in range(int(docs * scale)):
+            # the full subset name, the document ids of PLoS_methods and PLoS_sentences must not collide
+            name = "PMC{}-{}".format(subset, d)
+            _, doc_id = convert.document_ids(name)
+            lines = []
+            ann = []
+            offset = 0
+            n_ent = 0
+            n_rel = 0
+            for sent_idx in range(max(1, int(rng.gauss(sentences, sentences / 4)))):
+                n_mentions = int(mention_rate[subset]) + (rng.random() < mention_rate[subset] % 1)
+                text, entities, relations = synthetic_sentence(rng, n_mentions)
+                ids = []
+                for label, beg, end, string in entities:
+                    n_ent += 1
+                    ids.append("T{}".format(n_ent))
+                    ann.append("T{}\t{} {} {}\t{}".format(n_ent, label, offset + beg, offset + end, string))
+                    record = {'paper_id' : doc_id, 'sentence_id' : sent_idx, 'mention' : string, 'beg' : beg, 'end' : end}
+                    if label in mappings.entity_map and label.split('_')[0] in mappings.software:
+                        link = "https://www.wikidata.org/wiki/Q{}".format(software_names.index(string)) if rng.random() < 0.8 else string
+                        linking['artifacts.json'].append(dict(record, link=link))
+                    elif label == 'Developer':
+                        linking['developer.json'].append(dict(record, link="https://www.wikidata.org/wiki/{}".format(string.replace(' ', '_'))))
+                    elif label == 'License':
+                        linking['license.json'].append(dict(record, link="https://spdx.org/licenses/{}".format(string.replace(' ', '-'))))
+                    elif label == 'Citation':
+                        linking['citations.json'].append({'paper_id' : doc_id, 'mention' : string, 'links' : ["https://doi.org/10.1000/{}".format(string.strip('[]'))]})
+                for label, info, sw in relations:
+                    n_rel += 1
+                    ann.append("R{}\t{} Arg1:{} Arg2:{}".format(n_rel, label, ids[info], ids[sw]))
+                lines.append(text)
+                offset += len(text) + 1
+            with open(os.path.join(folder, subset, name + ".txt"), 'w') as f:
+                f.write("\n".join(lines))
+            with open(os.path.join(folder, subset, name + ".ann"), 'w') as f:
+                f.write("\n".join(ann) + "\n")
+            n_docs += 1
+    os.makedirs(os.path.join(folder, "Linking"), exist_ok=True)
+    for filename, records in linking.items():
+        with open(os.path.join(folder, "Linking", filename), 'w') as f:
+            json.dump(records, f)
+    return n_docs
+
+def benchmark_corpus(folder, out_folder):
+    """Time the build stages on a corpus folder, returns a dict of measurements."""
+    jobs = []
+    for subset, (sub_dataset, _, _) in subsets.items():
+        path = os.path.join(folder, subset)
+        jobs += [(os.path.join(path, fn), sub_dataset) for fn in sorted(os.listdir(path)) if fn.endswith(".txt")]
+    result = {'documents' : len(jobs), 'stages' : {}}
+
+    start = time.perf_counter()
+    linking.load(os.path.join(folder, "Linking"))
+    result['stages']['linking_load'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    n_sentences = n_entities = 0
+    for filename, _ in jobs:
+        with open(filename, 'r') as text_file, open(os.path.splitext(filename)[0] + ".ann", 'r') as ann_file:
+            sentences, entities, _ = brat.read_brat(text_file.read(), ann_file.read())
+        n_sentences += len(sentences)
+        n_entities += len(entities)
+    result['stages']['annotation_parsing'] = time.perf_counter() - start
+    result['sentences'] = n_sentences
+    result['entities'] = n_entities
+
+    # triple generation includes reading and parsing the documents once more, as in the build, 
+    # and adding them to a graph on the same store
+    g = metadata.new_graph()
+    start = time.perf_counter()
+    convert.convert_documents(g, jobs)
+    result['stages']['triple_generation'] = time.perf_counter() - start
+    result['triples'] = len(g)
+
+    start = time.perf_counter()
+    write_jsonld(g, os.path.join(out_folder, "somesci.jsonld"))
+    result['stages']['jsonld_serialization'] = time.perf_counter() - start
+
+    result['warnings'] = sink.counts
+    sink.counts = {}
+    sink.examples = {}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scales", nargs="+", type=float, default=[1, 10, 100], help="corpus sizes as multiples of SoMeSci")
+    parser.add_argument("--workdir", help="folder for the generated corpora, a temporary folder by default")
+    parser.add_argument("--keep", action="store_true", help="keep the generated corpora")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark.json", help="JSON file for the measurements")
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="somesci-bench-")
+    results = []
+    try:
+        for scale in args.scales:
+            folder = os.path.join(workdir, "scale{:g}".format(scale))
+            start = time.perf_counter()
+            generate_corpus(folder, scale, args.seed)
+            print("Generated {:g}x corpus in {:.1f}s".format(scale, time.perf_counter() - start))
+            result = benchmark_corpus(folder, folder)
+            result['scale'] = scale
+            results.append(result)
+            print("{:g}x: {} documents, {} entities, {} triples".format(scale, result['documents'], result['entities'], result['triples']))
+            for stage, seconds in result['stages'].items():
+                print("    {:<22} {:10.2f}s".format(stage, seconds))
+            if not args.keep:
+                shutil.rmtree(folder)
+    finally:
+        if not args.keep and not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Creation of the SoMeSci knowledge graph from the annotated corpus.
+
+The mapping tables and converters are available from the package, their
+modules (and rdflib/lxml) are only imported when they are first accessed.
+"""
+import importlib
+
+
+_exports = {
+    'context' : 'mappings',
+    'keywords' : 'mappings',
+    'software' : 'mappings',
+    'mention' : 'mappings',
+    'entity_map' : 'mappings',
+    'phrase_map' : 'mappings',
+    'relation_map' : 'mappings',
+    'inv_relation_map' : 'mappings',
+    'link_entities' : 'mappings',
+    'read_brat' : 'brat',
+    'LinkingIndex' : 'linking',
+    'LinkingStore' : 'linking',
+    'get_index' : 'linking',
+    'AliasIndex' : 'aliases',
+    'nodes_from_PMC_ID' : 'convert',
+    'convert_document' : 'convert',
+    'convert_documents' : 'convert',
+    'TripleList' : 'convert',
+    'metadata_graph' : 'metadata',
+    'TripleWriter' : 'writers',
+    'jsonld_from_stream' : 'writers',
+    'write_binary' : 'binary',
+    'BinaryGraph' : 'binary',
+    'TextResolver' : 'text',
+    'TripleStore' : 'store',
+    'TrainingExport' : 'training',
+    'DocumentStore' : 'documents',
+    'build' : 'build',
+    'write_metadata' : 'build',
+    'warning' : 'diagnostics',
+    'sink' : 'diagnostics',
+    'report' : 'diagnostics',
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    return getattr(importlib.import_module("." + _exports[name], __name__), name)
@@ -0,0 +1,104 @@
+"""Index of the software names in artifacts.json for resolving new mentions to identities.
+
+Mentions are normalized (Unicode NFKC, case folded, punctuation other than + and #
+removed, whitespace collapsed), so that e.g. "SPSS-Statistics", "spss statistics"
+and "SPSS  Statistics" share one alias. Exact lookups are dictionary lookups, prefix
+lookups a binary search over the sorted aliases. The index is pickled and only
+rebuilt when artifacts.json changes.
+"""
+from bisect import bisect_left
+from collections import Counter, defaultdict
+import json
+import os
+import pickle
+import re
+import unicodedata
+
+
+separators = re.compile(r"[^\w+#]+")
+
+
+def normalize(name):
+    """Normalized alias of a mention, e.g. 'GraphPad Prism®' -> 'graphpad prism'."""
+    name = unicodedata.normalize("NFKC", name).casefold()
+    return " ".join(separators.sub(" ", name.replace("_", " ")).split())
+
+def squeeze(alias):
+    """Alias without spaces, which matches spelling variants such as 'graph pad' and 'graphpad'."""
+    return alias.replace(" ", "")
+
+
+class AliasIndex:
+    """Candidate identities (its:taIdentRef values) of normalized software names.
+
+    Candidates are (link, count) pairs, the most frequent link of an alias first.
+
+        index = AliasIndex.open("somesci-aliases.pickle", "SoMeSci/Linking/artifacts.json")
+        index.resolve("SPSS statistics")        # [('https://www.wikidata.org/wiki/Q...', 12), ...]
+        index.complete("graph", limit=5)         # aliases starting with 'graph' and their candidates
+    """
+    version = 1
+
+    def __init__(self, aliases, source=None):
+        self.source = source
+        self.candidates = {alias : [(link, n) for link, n in sorted(links.items(), key=lambda l: (-l[1], l[0]))]
+                           for alias, links in aliases.items()}
+        self.keys = sorted(self.candidates)
+        squeezed = defaultdict(Counter)
+        for alias, links in aliases.items():
+            squeezed[squeeze(alias)].update(links)
+        self.squeezed = {alias : [(link, n) for link, n in sorted(links.items(), key=lambda l: (-l[1], l[0]))]
+                         for alias, links in squeezed.items()}
+
+    @classmethod
+    def from_file(cls, filename):
+        """Index of the linked mentions of an artifacts.json file."""
+        with open(filename, 'r') as f:
+            records = json.load(f)
+        aliases = defaultdict(Counter)
+        for record in records:
+            alias = normalize(record['mention'])
+            if alias and record.get('link'):
+                aliases[alias][record['link']] += 1
+        stat = os.stat(filename)
+        return cls(aliases, source=(filename, stat.st_size, stat.st_mtime_ns))
+
+    @classmethod
+    def open(cls, path, filename):
+        """Load the index pickled at path, (re)building and pickling it first if filename changed."""
+        stat = os.stat(filename)
+        try:
+            with open(path, 'rb') as f:
+                version, index = pickle.load(f)
+            if version == cls.version and index.source == (filename, stat.st_size, stat.st_mtime_ns):
+                return index
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, AttributeError):
+            pass
+        index = cls.from_file(filename)
+        index.save(path)
+        return index
+
+    def save(self, path):
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((self.version, self), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def resolve(self, name):
+        """Candidates of a mention, matched on its normalized form or, failing that, without spaces."""
+        alias = normalize(name)
+        return self.candidates.get(alias) or self.squeezed.get(squeeze(alias), [])
+
+    def complete(self, prefix, limit=10):
+        """Up to limit (alias, candidates) pairs of the aliases starting with the normalized prefix, in alias order."""
+        prefix = normalize(prefix)
+        matches = []
+        for i in range(bisect_left(self.keys, prefix), len(self.keys)):
+            alias = self.keys[i]
+            if not alias.startswith(prefix) or len(matches) >= limit:
+                break
+            matches.append((alias, self.candidates[alias]))
+        return matches
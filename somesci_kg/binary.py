@@ -0,0 +1,200 @@
+"""Dictionary-encoded binary triple files that are memory-mapped for lookups.
+
+Layout, all integers little-endian:
+
+    header       magic b"SKGB", version (uint32), number of terms and triples (uint64 each), 8 bytes padding
+    offsets      number of terms + 1 uint64, start of every term in the term section
+    spo          number of triples x 3 uint32 term ids, sorted by subject, predicate, object
+    ops          the same triples as object, predicate, subject, sorted
+    terms        the terms in N-Triples syntax (UTF-8), sorted, so that the id of a term is its rank
+
+Only the rows and terms that are needed for a lookup are read, the graph is never deserialized.
+"""
+from array import array
+from bisect import bisect_left
+import mmap
+import re
+import struct
+import sys
+
+from rdflib import Literal, URIRef
+from rdflib.term import Identifier
+
+from .writers import nt_term
+
+
+magic = b"SKGB"
+version = 1
+header = struct.Struct("<4sIQQ8x")
+
+# terms as written by nt_term, and the escapes it uses
+nt_token = re.compile(r'<[^>]*>|"(?:[^"\\]|\\.)*"(?:@[\w-]+|\^\^<[^>]*>)?|_:\S+')
+nt_literal = re.compile(r'"((?:[^"\\]|\\.)*)"(?:@([\w-]+)|\^\^<([^>]*)>)?$', re.S)
+nt_escape = re.compile(r'\\(.)')
+unescape = {'n' : '\n', 'r' : '\r', 't' : '\t'}
+
+
+def graph_triples(g):
+    """Triples of an rdflib graph in N-Triples syntax."""
+    for triple in g:
+        yield tuple(nt_term(t) for t in triple)
+
+def stream_triples(source):
+    """Triples of an N-Triples/N-Quads file as written by TripleWriter, the graph names are dropped."""
+    with open(source, 'r', encoding='utf-8') as f:
+        for line in f:
+            terms = nt_token.findall(line)
+            if len(terms) >= 3:
+                yield tuple(terms[:3])
+
+def decode(term):
+    """rdflib term of a term in N-Triples syntax."""
+    if term.startswith('<'):
+        return URIRef(term[1:-1])
+    value, language, datatype = nt_literal.match(term).groups()
+    value = nt_escape.sub(lambda m: unescape.get(m.group(1), m.group(1)), value)
+    return Literal(value, lang=language, datatype=URIRef(datatype) if datatype else None)
+
+def write_binary(triples, destination):
+    """Write (s, p, o) triples in N-Triples syntax to destination, duplicates are stored once.
+    Returns the number of triples."""
+    triples = set(triples)
+    terms = sorted({t for triple in triples for t in triple})
+    ids = {t : i for i, t in enumerate(terms)}
+    spo = sorted((ids[s], ids[p], ids[o]) for s, p, o in triples)
+    ops = sorted((o, p, s) for s, p, o in spo)
+
+    encoded = [t.encode('utf-8') for t in terms]
+    offsets = array('Q', [0])
+    for term in encoded:
+        offsets.append(offsets[-1] + len(term))
+    sections = [offsets, array('I', (i for row in spo for i in row)), array('I', (i for row in ops for i in row))]
+    if sys.byteorder == 'big':
+        for section in sections:
+            section.byteswap()
+    with open(destination, 'wb') as f:
+        f.write(header.pack(magic, version, len(terms), len(spo)))
+        for section in sections:
+            section.tofile(f)
+        f.write(b"".join(encoded))
+    return len(spo)
+
+
+class _Rows:
+    """Sorted id triples of a memory-mapped array, as a sequence of tuples for bisect."""
+    def __init__(self, ids):
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.ids) // 3
+
+    def __getitem__(self, i):
+        return tuple(self.ids[3 * i : 3 * i + 3])
+
+    def range(self, prefix):
+        """Rows starting with the id prefix."""
+        upper = prefix[:-1] + (prefix[-1] + 1,)
+        for i in range(bisect_left(self, prefix), bisect_left(self, upper)):
+            yield self[i]
+
+class _Terms:
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return bytes(self.data[self.offsets[i] : self.offsets[i + 1]])
+
+class BinaryGraph:
+    """Read-only, memory-mapped view of a file written by write_binary().
+
+    Terms can be given as rdflib terms (compact and relative IRIs are expanded like
+    in the JSON-LD output) or as strings in N-Triples syntax. Lookups return terms in
+    N-Triples syntax, decode() turns them into rdflib terms.
+
+        kg = BinaryGraph("somesci.kgb")
+        for link in kg.objects(URIRef("PMC123/sentence4/T1"), URIRef("its:taIdentRef")):
+            print(decode(link))
+    """
+    def __init__(self, path):
+        if sys.byteorder == 'big':
+            raise RuntimeError("Binary triple files can only be read on little-endian machines")
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        file_magic, file_version, n_terms, n_triples = header.unpack_from(self.map)
+        if file_magic != magic or file_version != version:
+            raise ValueError("{} is not a binary triple file of version {}".format(path, version))
+        self.view = view = memoryview(self.map)
+        start = header.size
+        offsets = view[start : start + 8 * (n_terms + 1)].cast('Q')
+        start += 8 * (n_terms + 1)
+        self.spo = _Rows(view[start : start + 12 * n_triples].cast('I'))
+        start += 12 * n_triples
+        self.ops = _Rows(view[start : start + 12 * n_triples].cast('I'))
+        start += 12 * n_triples
+        self.terms = _Terms(view[start:], offsets)
+
+    def __len__(self):
+        return len(self.spo)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        # the memoryviews have to be released before the map can be closed
+        for ids in (self.spo.ids, self.ops.ids, self.terms.offsets):
+            ids.release()
+        self.terms.data.release()
+        self.view.release()
+        self.map.close()
+        self.file.close()
+
+    def term(self, term_id):
+        return self.terms[term_id].decode('utf-8')
+
+    def term_id(self, term):
+        """Id of the term or None if it does not occur."""
+        if isinstance(term, Identifier):
+            term = nt_term(term)
+        encoded = term.encode('utf-8')
+        i = bisect_left(self.terms, encoded)
+        if i < len(self.terms) and self.terms[i] == encoded:
+            return i
+        return None
+
+    def triples(self, pattern):
+        """Triples matching the (s, p, o) pattern, None matches any term."""
+        ids = []
+        for term in pattern:
+            if term is None:
+                ids.append(None)
+                continue
+            ids.append(self.term_id(term))
+            if ids[-1] is None:
+                return
+        s, p, o = ids
+        if s is not None:
+            prefix = (s,) if p is None else (s, p)
+            rows = (row for row in self.spo.range(prefix) if o is None or row[2] == o)
+        elif o is not None:
+            prefix = (o,) if p is None else (o, p)
+            rows = ((s, p, o) for o, p, s in self.ops.range(prefix))
+        else:
+            # only the predicate is bound, there is no ordering for it
+            rows = (row for row in (self.spo[i] for i in range(len(self.spo))) if p is None or row[1] == p)
+        for row in rows:
+            yield tuple(self.term(i) for i in row)
+
+    def objects(self, subject, predicate):
+        for _, _, o in self.triples((subject, predicate, None)):
+            yield o
+
+    def subjects(self, predicate, obj):
+        for s, _, _ in self.triples((None, predicate, obj)):
+            yield s
@@ -0,0 +1,39 @@
+"""Reading of brat annotated documents."""
+from bisect import bisect_right
+
+
+def read_brat(text, ann):
+    """Parse a brat annotation in one pass and split its text into sentences (one per line).
+
+    Gives the same sentences as articlenizer's sentence_based_info with all corrections 
+    disabled: each sentence has its 'string' and its 'entities' with offsets relative 
+    to the sentence. Entities are assigned to sentences by a binary search over the 
+    sentence start offsets. Also returns all entities and relations of the document.
+    """
+    sentences = []
+    starts = []
+    offset = 0
+    for line in text.split('\n'):
+        starts.append(offset)
+        sentences.append({'string' : line, 'entities' : {}})
+        offset += len(line) + 1
+
+    entities = {}
+    relations = {}
+    for line in ann.split('\n'):
+        fields = line.split('\t')
+        if line.startswith('T'):
+            label, *offsets = fields[1].split(' ')
+            # discontinuous spans (10 15;20 25) are treated as one span
+            entity = {'label' : label, 'beg' : int(offsets[0]), 'end' : int(offsets[-1]), 'string' : fields[2]}
+            entities[fields[0]] = entity
+
+            sent_idx = bisect_right(starts, entity['beg']) - 1
+            sent_beg = starts[sent_idx]
+            if entity['end'] > sent_beg + len(sentences[sent_idx]['string']):
+                raise(RuntimeError("Entity error at {}: {}-{} vs {}-{}".format(fields[0], entity['beg'], entity['end'], sent_beg, sent_beg + len(sentences[sent_idx]['string']))))
+            sentences[sent_idx]['entities'][fields[0]] = dict(entity, beg=entity['beg'] - sent_beg, end=entity['end'] - sent_beg)
+        elif line.startswith('R'):
+            label, arg1, arg2 = fields[1].split(' ')
+            relations[fields[0]] = {'label' : label, 'arg1' : arg1.split(':')[1], 'arg2' : arg2.split(':')[1]}
+    return sentences, entities, relations
@@ -0,0 +1,236 @@
+"""Building the whole knowledge graph from the corpus."""
+import multiprocessing
+import os
+import time
+
+from rdflib import Graph, URIRef, Literal
+
+from . import linking, sections
+from .binary import graph_triples, stream_triples, write_binary
+from . import convert
+from .convert import convert_documents
+from .diagnostics import sink, report, collect_outputs, replay_outputs
+from .documents import documents as document_store
+from .metadata import metadata_graph, new_graph, subsets
+from .stats import graph_void_counts, statistics, void_counts
+from .store import disk_graph, serialize_jsonld
+from .training import training
+from .writers import TripleWriter, jsonld_from_stream, write_jsonld
+
+
+def list_documents(corpus, folder):
+    path = os.path.join(corpus, folder)
+    return [os.path.join(path, file) for file in os.listdir(path) if file.endswith(".txt")]
+
+def write_metadata(destination="somesci-metadata.jsonld"):
+    g = metadata_graph()
+    write_jsonld(g, destination)
+    return g
+
+def shard_file(output, name, output_format):
+    return "{}-{}.{}".format(output, name, "jsonld" if output_format == "json-ld" else output_format)
+
+# training records and documents are written by the shards themselves
+shard_outputs = (sink, statistics)
+
+def write_shard(job):
+    """Convert one subset into its own file.
+
+    Returns the VoID counts of the subset, its warnings and statistics (see 
+    shard_outputs) and document timings, which are recorded by the caller in subset order.
+    """
+    name, files, destination, output_format, cache_dir, prefetch_depth = job
+    if document_store.enabled:
+        # appended to the document store by the caller, in subset order
+        document_store.open(destination + ".documents")
+    first_document = len(report.documents)
+    start = time.perf_counter()
+    with collect_outputs(shard_outputs) as outputs:
+        if output_format == "json-ld":
+            target = new_graph()
+        else:
+            target = TripleWriter(destination, quads=output_format == "nq")
+        convert_documents(target, [(doc, subsets[name]) for doc in files], 1, cache_dir, prefetch_depth)
+        if output_format == "json-ld":
+            counts = graph_void_counts(target)
+            write_jsonld(target, destination)
+        else:
+            target.close()
+            # counted from the written file, a shard may not fit into memory
+            counts = void_counts(destination, tmp_dir=os.path.dirname(os.path.abspath(destination)))
+    # every shard writes the training records of its own subset
+    training.close()
+    document_store.close()
+    documents = report.documents[first_document:]
+    del report.documents[first_document:]
+    return counts, outputs, documents, time.perf_counter() - start
+
+def write_shards(g, documents, output, output_format, workers=1, cache_dir=None, prefetch_depth=16):
+    """Write every subset to its own shard, up to workers at once, and g with the VoID counts of the subsets 
+    to <output>-metadata. Returns the shard files and the total number of triples."""
+    jobs = [(name, files, shard_file(output, name, output_format), output_format, cache_dir, prefetch_depth) 
+            for name, files in documents.items()]
+    # the shards write their document records to their own part first
+    documents_file = document_store.path
+    if workers <= 1:
+        results = [write_shard(job) for job in jobs]
+    else:
+        # load the linking index before forking, so that the shards share it
+        linking.get_index()
+        with multiprocessing.get_context("fork").Pool(min(workers, len(jobs))) as pool:
+            results = pool.map(write_shard, jobs)
+
+    if document_store.enabled:
+        document_store.open(documents_file)
+    n_triples = 0
+    for (name, _, destination, _, _, _), (counts, outputs, shard_documents, seconds) in zip(jobs, results):
+        replay_outputs(shard_outputs, outputs)
+        if document_store.enabled:
+            document_store.append(destination + ".documents")
+        report.documents.extend(shard_documents)
+        report.stages.append({'stage' : "shard {}".format(name), 'seconds' : seconds})
+        for predicate, count in counts.items():
+            g.add((subsets[name], URIRef(predicate), Literal(count)))
+        n_triples += counts['void:triples']
+        print("{}: {} triples written to {}".format(name, counts['void:triples'], destination))
+
+    for triple in statistics.partition_triples():
+        g.add(triple)
+    destination = shard_file(output, "metadata", output_format)
+    if output_format == "json-ld":
+        write_jsonld(g, destination)
+    else:
+        writer = TripleWriter(destination, quads=output_format == "nq")
+        for triple in g:
+            writer.add(triple)
+        writer.close()
+    return [job[2] for job in jobs] + [destination], n_triples + len(g)
+
+def build(corpus='SoMeSci', subset_names=None, workers=1, output_format="json-ld", output="somesci", 
+          stream_to_jsonld=False, cache_dir=None, vocabulary="empty_graph.jsonld",
+          metadata_file="somesci-metadata.jsonld", warnings_file="somesci-warnings.jsonl", 
+          report_file="somesci-build-report.json", statistics_file="somesci-statistics.json", 
+          shards=False, binary=False, prefetch_depth=16, compact=False, store=None, 
+          training_folder=None, training_shard_size=10000, documents_file=None):
+    """Convert the corpus (or only the given subsets) and write the graph to <output>.jsonld/.nt/.nq.
+
+    output_format "json-ld" keeps the whole graph in memory, "nt" and "nq" stream the documents 
+    to disk as they are converted (nq with one named graph per subset). stream_to_jsonld 
+    additionally converts the streamed output to JSON-LD afterwards. With a cache_dir only 
+    changed documents are converted. Without workers, up to prefetch_depth documents are 
+    read ahead while converting. Warnings go to warnings_file as JSONL, timings and 
+    peak memory to report_file, either can be None. The counts of documents, mentions 
+    and relations (see stats.BuildStatistics) are written to statistics_file, if given, 
+    and added to the graph as VoID class and property partitions of the dataset.
+
+    With shards, every subset is written to <output>-<subset>.<ext> by its own worker and 
+    the meta data and vocabulary, including void:triples, void:entities and 
+    void:distinctSubjects of every subset, to <output>-metadata.<ext>.
+
+    binary additionally writes the graph to <output>.kgb, see binary.BinaryGraph.
+    compact leaves out the strings of sentences and mentions, which only keep their 
+    offsets into the document text, see text.TextResolver.
+    store keeps the JSON-LD graph in a SQLite database at that path instead of in 
+    memory (see store.TripleStore) and streams it from there into the output.
+    With a training_folder, the sentences are also exported as NER/RE training data 
+    in shards of training_shard_size sentences, see training.TrainingExport.
+    With a documents_file, the JSON-LD of every document is also written to it 
+    and indexed for random access, see documents.DocumentStore.
+    """
+    if warnings_file is not None:
+        sink.open(warnings_file)
+    # section maps, if enabled, are cached together with the fragments
+    sections.cache_dir = cache_dir
+    convert.compact = compact
+    if training_folder is not None:
+        training.open(training_folder, training_shard_size)
+    if documents_file is not None:
+        document_store.open(documents_file)
+    with report.stage("load linking"):
+        index = linking.get_index()
+    print("Ambiguous linking keys: {}".format({k : len(v) for k, v in index.ambiguous().items()}))
+
+    # create graph based with some predefined properties
+    with report.stage("metadata graph"):
+        g = metadata_graph()
+    if metadata_file is not None:
+        with report.stage("serialize metadata"):
+            write_jsonld(g, metadata_file)
+    with report.stage("parse empty graph"):
+        # the JSON-LD parser needs a context aware store, its triples are added in sorted 
+        # order, as the default store does not keep them in a reproducible order
+        for triple in sorted(Graph().parse(vocabulary, format="json-ld")):
+            g.add(triple)
+    if store is not None and output_format == "json-ld" and not shards:
+        with report.stage("open store"):
+            disk = disk_graph(store)
+            for triple in g:
+                disk.add(triple)
+            g = disk
+
+    documents = {}
+    for name in subset_names or subsets:
+        documents[name] = list_documents(corpus, name)
+        print("{}: {} documents".format(name, len(documents[name])))
+
+    if shards:
+        with report.stage("write shards"):
+            shard_files, n_triples = write_shards(g, documents, output, output_format, workers, cache_dir, prefetch_depth)
+        if stream_to_jsonld and output_format != "json-ld":
+            with report.stage("serialize"):
+                for shard in shard_files:
+                    jsonld_from_stream(shard, os.path.splitext(shard)[0] + ".jsonld", quads=output_format == "nq")
+        return finish(n_triples, workers, output_format, report_file, statistics_file)
+
+    if output_format == "json-ld":
+        target = g
+    else:
+        # stream the document triples to disk, only metadata and vocabulary are kept in g
+        quads = output_format == "nq"
+        destination = "{}.{}".format(output, output_format)
+        target = TripleWriter(destination, quads=quads)
+        for triple in g:
+            target.add(triple)
+
+    for name, files in documents.items():
+        with report.stage("convert {}".format(name)):
+            convert_documents(target, [(doc, subsets[name]) for doc in files], workers, cache_dir, prefetch_depth)
+    for triple in statistics.partition_triples():
+        target.add(triple)
+
+    if output_format == "json-ld":
+        with report.stage("serialize"):
+            if store is not None:
+                serialize_jsonld(g, output + ".jsonld")
+            else:
+                write_jsonld(g, output + ".jsonld")
+        n_triples = len(g)
+        if binary:
+            with report.stage("binary"):
+                write_binary(graph_triples(g), output + ".kgb")
+        if store is not None:
+            g.store.close()
+    else:
+        target.close()
+        n_triples = target.count
+        if stream_to_jsonld:
+            with report.stage("serialize"):
+                jsonld_from_stream(destination, output + ".jsonld", quads=quads)
+        if binary:
+            with report.stage("binary"):
+                write_binary(stream_triples(destination), output + ".kgb")
+    return finish(n_triples, workers, output_format, report_file, statistics_file)
+
+def finish(n_triples, workers, output_format, report_file, statistics_file):
+    sink.close()
+    sink.summary()
+    print("Unmatched linking keys: {}".format(dict(statistics.counters['unmatched'])))
+    training.close()
+    document_store.close()
+    if statistics_file is not None:
+        statistics.write(statistics_file)
+
+    print("Number of triples in graph: {}".format(n_triples))
+    if report_file is not None:
+        report.write(report_file, triples=n_triples, warnings=sink.counts, workers=workers, output_format=output_format)
+    return n_triples
@@ -0,0 +1,171 @@
+"""Command line interface: python3 -m somesci_kg <command>."""
+import argparse
+import json
+import os
+import sys
+
+from rdflib import URIRef
+
+from . import linking, sections
+from .metadata import subsets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="somesci_kg", description="Create the SoMeSci knowledge graph.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    metadata = commands.add_parser("metadata", help="write only the dataset meta data")
+    metadata.add_argument("--output", default="somesci-metadata.jsonld")
+
+    build = commands.add_parser("build", help="convert the corpus into the knowledge graph")
+    build.add_argument("--corpus", default="SoMeSci", help="folder with the subset folders")
+    build.add_argument("--linking", default=linking.path, help="folder with the linking files")
+    build.add_argument("--linking-db", help="query the linking records from this SQLite database, rebuilt when the linking files change")
+    build.add_argument("--sections", action="store_true", 
+                       help="add section nodes from .src files next to the texts or from the NXML files in --xml-folder")
+    build.add_argument("--xml-folder", help="folder with <subset>/<id>.nxml files of the articles")
+    build.add_argument("--subset", action="append", choices=list(subsets), help="only convert this subset, can be repeated")
+    build.add_argument("--workers", type=int, default=1, help="worker processes for the conversion")
+    build.add_argument("--format", choices=["json-ld", "nt", "nq"], default="json-ld", 
+                       help="nt and nq stream the triples to disk instead of keeping them in memory")
+    build.add_argument("--to-jsonld", action="store_true", help="also convert streamed nt/nq output to JSON-LD")
+    build.add_argument("--output", default="somesci", help="output file name without extension")
+    build.add_argument("--compact", action="store_true", 
+                       help="sentences and mentions only get offsets into the document text instead of their own strings")
+    build.add_argument("--binary", action="store_true", help="also write the graph as dictionary-encoded binary triples to <output>.kgb")
+    build.add_argument("--store", help="keep the JSON-LD graph in this SQLite database instead of in memory, for corpora larger than RAM")
+    build.add_argument("--training", metavar="FOLDER", help="also export the sentences as BIO tagged NER/RE training data to FOLDER/<subset>/part-*.jsonl.gz")
+    build.add_argument("--training-shard-size", type=int, default=10000, help="sentences per training data file")
+    build.add_argument("--documents", metavar="FILE", help="also write the JSON-LD of every document to FILE, indexed by document id in FILE.idx")
+    build.add_argument("--shards", action="store_true", 
+                       help="write every subset to <output>-<subset> concurrently and the meta data with VoID counts to <output>-metadata")
+    build.add_argument("--prefetch", type=int, default=16, 
+                       help="documents read ahead while converting without workers, 0 reads every document when needed")
+    build.add_argument("--cache-dir", help="cache converted documents, only changed ones are converted again")
+    build.add_argument("--vocabulary", default="empty_graph.jsonld")
+    build.add_argument("--metadata-file", default="somesci-metadata.jsonld")
+    build.add_argument("--warnings-file", default="somesci-warnings.jsonl")
+    build.add_argument("--report-file", default="somesci-build-report.json")
+    build.add_argument("--statistics-file", default="somesci-statistics.json")
+
+    links = commands.add_parser("links", help="compile the linking files into a SQLite database and query it")
+    links.add_argument("--linking", default=linking.path, help="folder with the linking files")
+    links.add_argument("--db", default="somesci-linking.sqlite")
+    links.add_argument("--paper", help="print the linking records of this paper (e.g. https://www.ncbi.nlm.nih.gov/pmc/articles/PMC123) as JSON lines")
+
+    aliases = commands.add_parser("aliases", help="resolve software names to candidate identities of the linked mentions")
+    aliases.add_argument("names", nargs="+")
+    aliases.add_argument("--linking", default=linking.path, help="folder with the linking files")
+    aliases.add_argument("--index", default="somesci-aliases.pickle", help="alias index, rebuilt when artifacts.json changes")
+    aliases.add_argument("--prefix", action="store_true", help="list the aliases starting with the names instead")
+    aliases.add_argument("--limit", type=int, default=10, help="aliases listed per prefix")
+
+    lookup = commands.add_parser("lookup", help="print the triples of a binary graph file matching a pattern")
+    lookup.add_argument("file", help="file written by build --binary")
+    lookup.add_argument("--subject", help="IRI, compact (nif:Context) or relative to the dataset (PMC123/sentence0)")
+    lookup.add_argument("--predicate")
+    lookup.add_argument("--object", help="IRI, or a literal in N-Triples syntax")
+
+    verify = commands.add_parser("verify", help="check offsets, inverse relations and links of a built graph")
+    verify.add_argument("file", help="graph as N-Triples/N-Quads (streamed) or JSON-LD")
+    verify.add_argument("--workers", type=int, default=1, help="worker processes for the checks")
+    verify.add_argument("--samples", type=int, default=10, help="failures kept per check in the report")
+    verify.add_argument("--report", default="somesci-verify.json", help="JSON file for the failure report")
+
+    diff = commands.add_parser("diff", help="write the changes between two builds as a SPARQL Update")
+    diff.add_argument("old", help="previous build as N-Triples/N-Quads or JSON-LD")
+    diff.add_argument("new", help="current build, in the same format")
+    diff.add_argument("--output", default="somesci-changes.ru")
+    diff.add_argument("--run-lines", type=int, default=1000000, help="triples sorted in memory at a time")
+    diff.add_argument("--batch", type=int, default=10000, help="triples per DELETE DATA/INSERT DATA operation")
+    diff.add_argument("--tmp-dir", help="folder for the sorted runs (default: system temp folder)")
+
+    load = commands.add_parser("load", help="load a built graph into a SQLite triple table for local queries")
+    load.add_argument("file", help="graph as N-Triples/N-Quads (streamed) or JSON-LD")
+    load.add_argument("--db", default="somesci.sqlite")
+    load.add_argument("--batch", type=int, default=100000, help="triples per transaction")
+
+    query = commands.add_parser("query", help="print the mentions of a class or identity from a database written by load or build --store")
+    query.add_argument("db")
+    query.add_argument("--class", dest="class_ref", help="its:taClassRef, e.g. sms:Application")
+    query.add_argument("--link", help="its:taIdentRef IRI, or a literal in N-Triples syntax")
+    query.add_argument("--counts", action="store_true", help="print the number of mentions per link instead")
+    query.add_argument("--limit", type=int)
+
+    args = parser.parse_args(argv)
+    if args.command == "metadata":
+        from .build import write_metadata
+        write_metadata(args.output)
+    elif args.command == "build":
+        if args.shards and args.binary:
+            parser.error("--binary can not be combined with --shards")
+        if args.store and (args.shards or args.format != "json-ld"):
+            parser.error("--store only applies to the JSON-LD graph without --shards")
+        from .build import build
+        linking.path = args.linking
+        linking.database = args.linking_db
+        sections.enabled = args.sections
+        sections.xml_folder = args.xml_folder
+        build(corpus=args.corpus, subset_names=args.subset, workers=args.workers, output_format=args.format,
+              output=args.output, stream_to_jsonld=args.to_jsonld, cache_dir=args.cache_dir, 
+              vocabulary=args.vocabulary, metadata_file=args.metadata_file, 
+              warnings_file=args.warnings_file, report_file=args.report_file, 
+              statistics_file=args.statistics_file, shards=args.shards, binary=args.binary, 
+              prefetch_depth=args.prefetch, compact=args.compact, store=args.store, 
+              training_folder=args.training, training_shard_size=args.training_shard_size, 
+              documents_file=args.documents)
+    elif args.command == "links":
+        store = linking.LinkingStore.open(args.db, args.linking)
+        if args.paper:
+            for kind, record in store.paper_records(args.paper):
+                print(json.dumps(dict(record, kind=kind)))
+        else:
+            print("Ambiguous linking keys: {}".format({k : len(v) for k, v in store.ambiguous().items()}))
+    elif args.command == "aliases":
+        from .aliases import AliasIndex
+        index = AliasIndex.open(args.index, os.path.join(args.linking, linking.LinkingIndex.files['software']))
+        for name in args.names:
+            if args.prefix:
+                matches = [{'alias' : alias, 'candidates' : candidates} for alias, candidates in index.complete(name, args.limit)]
+            else:
+                matches = index.resolve(name)
+            print(json.dumps({'name' : name, 'matches' : matches}, ensure_ascii=False))
+    elif args.command == "lookup":
+        from .binary import BinaryGraph
+        pattern = [None if term is None else term if term.startswith('"') else URIRef(term) 
+                   for term in (args.subject, args.predicate, args.object)]
+        with BinaryGraph(args.file) as kg:
+            for triple in kg.triples(pattern):
+                print(" ".join(triple) + " .")
+    elif args.command == "verify":
+        from .verify import verify, summary
+        report = verify(args.file, workers=args.workers, samples=args.samples)
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=1)
+        summary(report)
+        if any(report['failures'].values()):
+            sys.exit(1)
+    elif args.command == "diff":
+        from .diff import diff
+        n_removed, n_added = diff(args.old, args.new, args.output, run_lines=args.run_lines, batch=args.batch, tmp_dir=args.tmp_dir)
+        print("{} triples removed, {} added, written to {}".format(n_removed, n_added, args.output))
+    elif args.command == "load":
+        from .store import load
+        n_triples = load(args.file, args.db, batch=args.batch)
+        print("Loaded {} triples into {}".format(n_triples, args.db))
+    elif args.command == "query":
+        from .binary import decode
+        from .store import TripleStore
+        from .writers import nt_term
+        class_ref, link = [None if term is None else decode(term) if term.startswith('"') else URIRef(term) 
+                           for term in (args.class_ref, args.link)]
+        store = TripleStore(args.db)
+        if args.counts:
+            for term, n in store.link_counts(class_ref, args.limit):
+                print("{}\t{}".format(n, nt_term(term)))
+        elif class_ref is None and link is None:
+            parser.error("query needs --class, --link or --counts")
+        else:
+            for mention, anchor, sentence in store.mentions(class_ref, link, args.limit):
+                print("\t".join("" if term is None else nt_term(term) for term in (mention, anchor, sentence)))
+        store.close()
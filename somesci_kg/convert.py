@@ -0,0 +1,370 @@
+"""Conversion of annotated documents into triples."""
+from collections import namedtuple
+from functools import partial
+import hashlib
+import inspect
+import json
+import multiprocessing
+import os
+import pickle
+import time
+
+from rdflib import URIRef, Literal
+
+from . import sections, terms
+from . import training as training_module
+from .brat import read_brat
+from .diagnostics import warning, sink, report, collect_outputs, replay_outputs
+from .documents import documents, document_record
+from .linking import get_index
+from .mappings import context, software, entity_map, phrase_map, relation_map, inv_relation_map, link_entities
+from .prefetch import prefetch, read_document
+from .sections import document_sections
+from .terms import (rdf_type, nif_Context, nif_Sentence, nif_OffsetBasedString, nif_Section, nif_broaderContext, 
+                    nif_referenceContext, nif_superString, nif_isString, nif_anchorOf, nif_beginIndex, nif_endIndex, 
+                    its_taClassRef, its_taIdentRef, schema_isPartOf, schema_hasPart, dcterms_title, entity_classes, 
+                    phrase_classes, relation_predicates, inv_relation_predicates, iri, literal)
+from .stats import statistics
+from .training import training
+from .writers import TripleWriter
+
+
+def link_warning(kind, matches, message, document, sentence, **details):
+    """Warn about a mention without a unique linking record, unmatched ones are also counted per kind."""
+    if matches:
+        warning("ambiguous_link", message, document, sentence, **details)
+    else:
+        statistics.count('unmatched', kind)
+        warning("unmatched_link", message, document, sentence, **details)
+
+def add_types(g, node, *classes):
+    """Add the rdf:type triples of node, counted per class for the class partitions."""
+    for c in classes:
+        g.add((node, rdf_type, c))
+        statistics.count('types', str(c))
+
+def document_ids(filename):
+    doi, _ = os.path.splitext(os.path.basename(filename))
+    doi.replace('_','/')
+    doc_id = "https://www.ncbi.nlm.nih.gov/pmc/articles/{}".format(doi)
+    return doi, doc_id
+
+# compact graphs leave out the sentence strings and mention anchors, they are 
+# reconstructed from the document text and offsets by text.TextResolver
+compact = False
+
+def nodes_from_PMC_ID(g, filename,  sub_dataset, contents=None):
+    doi, doc_id = document_ids(filename)
+    linking = get_index()
+
+    # text and annotation, unless they were already read by prefetch()
+    text, ann = contents or read_document(filename)
+
+    sent_list, _, doc_relations = read_brat(text, ann)
+    
+    doc = URIRef(doi)
+    add_types(g, doc, nif_Context)
+    g.add((doc, nif_broaderContext, URIRef(doc_id)))
+    g.add((doc, nif_isString, Literal(text))) 
+    g.add((doc, schema_isPartOf, sub_dataset)) 
+    g.add((sub_dataset, schema_hasPart, doc))
+    statistics.count('documents', str(sub_dataset))
+
+    if len(text.strip()) == 0:
+        warning("empty_text", "Empty text file: {}".format(filename), doc_id)
+
+    # sections of the document, only if section maps are enabled and available
+    section_nodes = []
+    for sec_idx, section in enumerate(document_sections(filename)):
+        nsection = URIRef("{}/section{}".format(doi, sec_idx))
+        add_types(g, nsection, nif_Section, nif_OffsetBasedString)
+        g.add((nsection, nif_referenceContext, doc))
+        g.add((nsection, nif_beginIndex, literal(section['Begin'])))
+        g.add((nsection, nif_endIndex, literal(section['End'])))
+        g.add((nsection, dcterms_title, literal(section['Title'])))
+        section_nodes.append((section['Begin'], section['End'], nsection))
+
+    sent_nodes = {}
+    
+    start_idx = 0
+    # offset of the sentence in the document, to find its section
+    sent_begin = 0
+    for sent_idx, sent in enumerate(sent_list):
+        sent_id = "{}/sentence{}".format(doi, sent_idx)
+        nsent = URIRef(sent_id)
+        sent_end = sent_begin + len(sent['string'])
+        statistics.count('sentences', str(sub_dataset))
+        if compact:
+            # offsets into the document text instead of a copy of the sentence
+            add_types(g, nsent, nif_Sentence, nif_OffsetBasedString)
+            g.add((nsent, nif_referenceContext, doc))
+            g.add((nsent, nif_beginIndex, literal(sent_begin)))
+            g.add((nsent, nif_endIndex, literal(sent_end)))
+        else:
+            add_types(g, nsent, nif_Context, nif_Sentence, nif_OffsetBasedString)
+#            g.add((nsent, URIRef("schema:isPartOf"), sub_dataset))
+            g.add((nsent, nif_broaderContext, doc))
+            g.add((nsent, nif_beginIndex, literal(start_idx)))
+            end_idx = start_idx + len(sent['string'])
+            g.add((nsent, nif_endIndex, literal(end_idx)))
+            g.add((nsent, nif_isString, Literal(sent['string'])))
+        for sec_begin, sec_end, nsection in section_nodes:
+            if sec_begin <= sent_begin and sent_end <= sec_end:
+                g.add((nsent, nif_superString, nsection))
+        sent_begin = sent_end + 1
+
+ 
+        for eid, entity in sent['entities'].items():
+            #if "software_suggestion" == entity['label']:
+            #    warning("Found invalid entity")
+            #    continue
+
+            nentity = URIRef(sent_id + "/" + eid)
+            sent_nodes[eid] = nentity
+            
+            if not entity['label'] in phrase_map:
+                warning("missing_phrase_type", "No phrase type defined for {}".format(entity['label']), doc_id, sent_idx, entity=eid)
+                continue
+            else:
+                add_types(g, nentity, phrase_classes[entity['label']])
+            statistics.count('mentions', str(sub_dataset))
+            
+            #g.add((nentity, RDF.type, URIRef("nif:OffsetBasedString")))
+            if not compact:
+                g.add((nentity, nif_anchorOf, literal(entity['string'])))
+            g.add((nentity, nif_beginIndex, literal(entity['beg'])))
+            g.add((nentity, nif_endIndex, literal(entity['end'])))
+            g.add((nentity, nif_referenceContext, nsent))
+            
+            for classURL in entity_classes[entity['label']]:
+                g.add((nentity, its_taClassRef, classURL))
+                statistics.count('classes', str(classURL))
+
+            # link to identities if available
+            if not entity['label'] in link_entities:
+                continue
+            label0 = entity['label'].split('_')[0]
+
+            if label0 in software.keys():      
+                if linking.has_sentence('software', doc_id, sent_idx):
+                    # sentence in doc in list
+                    matches = linking.lookup('software', doc_id, sent_idx, entity['string'], entity['beg'], entity['end'])
+
+                    if len(matches) != 1:
+                        link_warning('software', matches, "No unique ({}) match found for {}({}:{}) in {}".format(len(matches), entity['string'], entity['beg'], entity['end'],  doc_id), doc_id, sent_idx, entity=eid)
+                    else:
+                        if not matches[0]['link'].startswith("http"):
+                            g.add((nentity, its_taIdentRef, literal(matches[0]['link'])))
+                        else:
+                            g.add((nentity, its_taIdentRef, iri(matches[0]['link'])))
+                        statistics.count('identities', matches[0]['link'])
+                        statistics.count('links', entity['label'])
+                else:
+                    link_warning('software', [], "Did not find entity '{}' of type '{}' in sentence {} in linking list of {}".format(entity['string'], label0, sent_idx,  doc_id), doc_id, sent_idx, entity=eid)
+                    
+            elif label0 == 'Developer':
+                #print("Found developer {} in document {}".format(entity['string'], doc_id))
+                if linking.has_sentence('developer', doc_id, sent_idx):
+                    # search for correct developer
+                    matches = linking.lookup('developer', doc_id, sent_idx, entity['string'], entity['beg'], entity['end'])
+                    #print(matches)
+                    if len(matches) != 1:
+                        link_warning('developer', matches, "No unique ({}) match found for {}({}:{}) in {}".format(len(matches), entity['string'], entity['beg'], entity['end'],  doc_id), doc_id, sent_idx, entity=eid)
+                    else:
+                        if not matches[0]['link'].startswith('http'):
+                            g.add((nentity, its_taIdentRef, literal(matches[0]['link'])))
+                        else:
+                            g.add((nentity, its_taIdentRef, iri(matches[0]['link'])))
+                        statistics.count('links', entity['label'])
+                else:
+                    link_warning('developer', [], "Developer {} not found for document {}".format(entity['string'],doc_id), doc_id, sent_idx, entity=eid)
+
+            elif entity['label'] == 'Citation':
+                refs = linking.citation_links(doc_id, entity['string'])
+                if refs is not None:
+                    for ref in refs:
+                        g.add((nentity, its_taIdentRef, iri(ref)))
+                        statistics.count('links', entity['label'])
+                else:     
+                    link_warning('citation', [], "Did not find reference '{}' in {}.".format(entity['string'], doc_id), doc_id, sent_idx, entity=eid)
+            elif entity['label'] == 'License':
+                if linking.has_sentence('license', doc_id, sent_idx):
+                    
+                    # search for correct licence
+                    matches = linking.lookup('license', doc_id, sent_idx, entity['string'], entity['beg'], entity['end'])
+
+                    if len(matches) != 1:
+                        link_warning('license', matches, "No unique ({}) licence match found for {}({}:{}) in {}".format(len(matches), entity['string'], entity['beg'], entity['end'],  doc_id), doc_id, sent_idx, entity=eid)
+                    else:
+                        if not matches[0]['link'].startswith("http"):
+                            g.add((nentity, its_taIdentRef, literal(matches[0]['link'])))
+                        else:
+                            g.add((nentity, its_taIdentRef, iri(matches[0]['link'])))
+                        statistics.count('links', entity['label'])
+                else:     
+                    link_warning('license', [], "Did not find licence '{}' in {}.".format(entity['string'], doc_id), doc_id, sent_idx, entity=eid)
+                
+            elif entity['label'] == 'URL':
+                url_link = entity['string']
+                if not url_link.startswith("http"):
+                    url_link = "http://{}".format(url_link)
+                else:
+                    g.add((nentity, its_taIdentRef, iri(url_link)))
+                    statistics.count('links', entity['label'])
+            else:
+                # entity is of type should be linked, but we have no map
+                warning("unlinkable", "Cannot link {}: {}".format(entity['label'], entity['string']), doc_id, sent_idx, entity=eid)
+
+    # finally, transfer relations from textual format for nif:inter based format
+    for relation in doc_relations.values():
+        #print(relation)
+        if relation['label'] not in relation_map:
+            warning("unknown_relation", "Unkown Relation: {}".format(relation['label']), doc_id)
+            continue
+
+        nsoftware = sent_nodes[relation['arg2']]
+        ninfo = sent_nodes[relation['arg1']]
+        g.add((ninfo, relation_predicates[relation['label']], nsoftware))
+        statistics.count('relations', relation['label'])
+        
+        if relation['label'] not in inv_relation_map:
+            warning("unknown_relation", "Unkown Relation: {}".format(relation['label']), doc_id)
+            continue
+        g.add((nsoftware, inv_relation_predicates[relation['label']], ninfo))
+        statistics.count('inverse_relations', relation['label'])
+
+    # NER/RE training data from the same annotations, if enabled
+    training.add_document(sub_dataset, doi, sent_list, doc_relations)
+    return
+
+
+class TripleList(list):
+    """Stand-in for a Graph that only records the added triples in order.
+
+    Workers convert into a TripleList, the parent then replays the triples 
+    into the actual graph in the same order a serial run would add them.
+    """
+    def add(self, triple):
+        self.append(triple)
+
+# the triples of a document and what it emitted to the side outputs, in the order of side_outputs
+Fragment = namedtuple('Fragment', ['triples', 'outputs'])
+side_outputs = (sink, statistics, training, documents)
+fragment_version = 2
+
+# cached fragments are invalidated whenever the conversion code, the mappings or the fragment format change
+converter_hash = hashlib.sha256(json.dumps([fragment_version, inspect.getsource(nodes_from_PMC_ID), inspect.getsource(read_brat), 
+    inspect.getsource(terms), inspect.getsource(training_module), inspect.getsource(document_record), context, software, 
+    entity_map, phrase_map, relation_map, inv_relation_map, link_entities]).encode()).hexdigest()
+
+def fragment_key(filename, sub_dataset, contents):
+    """Hash of everything the triples of a document depend on: its text, annotation, linking records and the converter."""
+    _, doc_id = document_ids(filename)
+    h = hashlib.sha256(converter_hash.encode())
+    h.update(filename.encode())
+    h.update(sub_dataset.encode())
+    for part in contents:
+        h.update(part.encode())
+    h.update(json.dumps(get_index().paper_records(doc_id), sort_keys=True).encode())
+    h.update(b"compact" if compact else b"full")
+    h.update(b"training" if training.enabled else b"")
+    h.update(b"documents" if documents.enabled else b"")
+    if sections.enabled:
+        h.update(sections.sources_key(filename).encode())
+    return h.hexdigest()
+
+def fragment_path(cache_dir, key):
+    return os.path.join(cache_dir, key[:2], key + ".pickle")
+
+def load_fragment(cache_dir, key):
+    """The cached fragment, None if there is none or it was written in another format."""
+    try:
+        with open(fragment_path(cache_dir, key), 'rb') as f:
+            fragment = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, TypeError, AttributeError):
+        return None
+    if not isinstance(fragment, Fragment) or len(fragment.outputs) != len(side_outputs):
+        return None
+    return fragment
+
+def store_fragment(cache_dir, key, fragment):
+    path = fragment_path(cache_dir, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # write to a temporary file first, other workers never see half written fragments
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(fragment, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+def convert_document(job, cache_dir=None, contents=None):
+    """Convert one document into its Fragment: the ordered triples and what it emitted to the side 
+    outputs (warnings, counts, training records and JSON-LD record).
+
+    With a cache_dir, unchanged documents are read from the cache. Returns the fragment, 
+    whether it was taken from the cache and the seconds it took.
+    """
+    filename, sub_dataset = job
+    start_time = time.perf_counter()
+    contents = contents or read_document(filename)
+    if cache_dir is not None:
+        key = fragment_key(filename, sub_dataset, contents)
+        fragment = load_fragment(cache_dir, key)
+        if fragment is not None:
+            return fragment, True, time.perf_counter() - start_time
+    # warnings, counts and records are recorded when the fragment is merged, in document order
+    with collect_outputs(side_outputs) as outputs:
+        triples = TripleList()
+        nodes_from_PMC_ID(triples, filename, sub_dataset, contents)
+        documents.add(document_ids(filename)[0], triples)
+    fragment = Fragment(triples, outputs)
+    if cache_dir is not None:
+        store_fragment(cache_dir, key, fragment)
+    return fragment, False, time.perf_counter() - start_time
+
+def convert_documents(g, jobs, workers=1, cache_dir=None, prefetch_depth=16):
+    """Convert (filename, sub_dataset) jobs into g, optionally on a pool of worker processes.
+
+    g is either a Graph or a TripleWriter. Results are merged in job order, 
+    so the graph and the warnings are the same as for a serial run. A serial run 
+    reads up to prefetch_depth documents ahead, worker processes read their own.
+    """
+    # document records need the triples of each document, which only fragments keep
+    if workers <= 1 and cache_dir is None and not documents.enabled:
+        for (filename, sub_dataset), contents in prefetch(jobs, prefetch_depth):
+            # counted as they are added, len() walks all triples of some stores
+            start = time.perf_counter()
+            triples = TripleList()
+            nodes_from_PMC_ID(triples, filename, sub_dataset, contents)
+            seconds = time.perf_counter() - start
+            target = target_graph(g, sub_dataset)
+            for triple in triples:
+                target.add(triple)
+            report.document(filename, sub_dataset, len(triples), seconds)
+        return
+    convert = partial(convert_document, cache_dir=cache_dir)
+    if workers <= 1:
+        results = (convert(job, contents=contents) for job, contents in prefetch(jobs, prefetch_depth))
+        merge_fragments(g, jobs, results, cache_dir)
+        return
+    # load the linking index before forking, so that the workers inherit it
+    get_index()
+    # no prefetching here: imap consumes its input eagerly, so the read-ahead would not be bounded
+    with multiprocessing.get_context("fork").Pool(workers) as pool:
+        merge_fragments(g, jobs, pool.imap(convert, jobs, chunksize=8), cache_dir)
+
+def merge_fragments(g, jobs, results, cache_dir=None):
+    cached = 0
+    for (filename, sub_dataset), (fragment, from_cache, seconds) in zip(jobs, results):
+        target = target_graph(g, sub_dataset)
+        for triple in fragment.triples:
+            target.add(triple)
+        replay_outputs(side_outputs, fragment.outputs)
+        cached += from_cache
+        report.document(filename, sub_dataset, len(fragment.triples), seconds, from_cache)
+    if cache_dir is not None:
+        print("Reused {} of {} documents from {}".format(cached, len(jobs), cache_dir))
+
+def target_graph(g, sub_dataset):
+    if isinstance(g, TripleWriter):
+        return g.named_graph(sub_dataset)
+    return g
@@ -0,0 +1,146 @@
+"""Structured warnings and timing report of a build."""
+from contextlib import contextmanager, ExitStack
+import json
+import resource
+import sys
+import time
+
+
+class Collector:
+    """Output of a build (warnings, counts, records) that can be diverted per document fragment.
+
+    emit() passes an item to output(), unless within collect(), which gathers the 
+    items instead. Gathered items are passed on later with replay(), e.g. when the 
+    fragments of the workers are merged in document order.
+    """
+    def __init__(self):
+        self.collected = None
+
+    @contextmanager
+    def collect(self):
+        """Divert the emitted items into a new collection, which is yielded."""
+        outer = self.collected
+        self.collected = self.collection()
+        try:
+            yield self.collected
+        finally:
+            self.collected = outer
+
+    def collection(self):
+        return []
+
+    def divert(self, *item):
+        self.collected.append(item)
+
+    def emit(self, *item):
+        if self.collected is not None:
+            self.divert(*item)
+            return
+        self.output(*item)
+
+    def output(self, *item):
+        raise NotImplementedError
+
+    def replay(self, collected):
+        """Emit the items of a collection again."""
+        for item in collected:
+            self.emit(*item)
+
+@contextmanager
+def collect_outputs(collectors):
+    """Divert all collectors at once, yields their collections as a tuple in the same order."""
+    with ExitStack() as stack:
+        yield tuple(stack.enter_context(collector.collect()) for collector in collectors)
+
+def replay_outputs(collectors, outputs):
+    """Replay the collections of collect_outputs() in the same order."""
+    for collector, collected in zip(collectors, outputs):
+        collector.replay(collected)
+
+
+class WarningSink(Collector):
+    """Collects structured warnings, writes them as JSONL and prints a summary per category.
+
+    Categories: empty_text, missing_phrase_type, unmatched_link, ambiguous_link, 
+    unlinkable, unknown_relation and section.
+    """
+    def __init__(self, samples=3):
+        super().__init__()
+        self.samples = samples
+        self.counts = {}
+        self.examples = {}
+        self.file = None
+
+    def open(self, destination):
+        self.file = open(destination, 'w', encoding='utf-8', buffering=1 << 20)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def output(self, record):
+        category = record['category']
+        self.counts[category] = self.counts.get(category, 0) + 1
+        if len(self.examples.setdefault(category, [])) < self.samples:
+            self.examples[category].append(record['message'])
+        if self.file is not None:
+            self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def summary(self):
+        print("Got {} warnings".format(self.total))
+        for category, count in sorted(self.counts.items(), key=lambda c: -c[1]):
+            print("  {}: {}".format(category, count))
+            for example in self.examples[category]:
+                print("    e.g. {}".format(example))
+
+sink = WarningSink()
+
+def warning(category, message, document=None, sentence=None, **details):
+    record = {'category' : category, 'message' : message, 'document' : document, 'sentence' : sentence}
+    record.update(details)
+    sink.emit(record)
+
+
+class BuildReport:
+    """Timings of the build stages and documents, written as JSON for monitoring."""
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = []
+        self.documents = []
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append({'stage' : name, 'seconds' : time.perf_counter() - start})
+
+    def document(self, filename, sub_dataset, triples, seconds, cached=False):
+        self.documents.append({'document' : filename, 'subset' : str(sub_dataset), 'triples' : triples, 'seconds' : seconds, 'cached' : cached})
+
+    @staticmethod
+    def peak_memory():
+        """Peak resident memory in KiB of this process and of its largest finished worker."""
+        # ru_maxrss is given in bytes on macOS and in KiB on Linux
+        scale = 1024 if sys.platform == 'darwin' else 1
+        return {
+            'self_kib' : resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale,
+            'workers_kib' : resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // scale
+        }
+
+    def write(self, destination, **summary):
+        report = dict(summary)
+        report['total_seconds'] = time.perf_counter() - self.started
+        report['peak_memory'] = self.peak_memory()
+        report['stages'] = self.stages
+        report['documents'] = self.documents
+        with open(destination, 'w') as f:
+            json.dump(report, f, indent=1)
+
+report = BuildReport()
@@ -0,0 +1,119 @@
+"""Changesets between two builds of the graph, computed with bounded memory.
+
+Both graphs are canonicalized into sorted, duplicate free N-Triples by an external
+sort (sorted runs of at most run_lines triples, merged with heapq.merge) and then
+merge-scanned. The removed and added triples are written as a SPARQL Update of
+DELETE DATA and INSERT DATA operations, which an endpoint can apply instead of
+reloading the whole graph.
+
+Graph names of N-Quads are dropped. Blank nodes are compared by their labels, the
+graph does not use any. Compare builds written in the same format: the JSON-LD
+parser normalizes some IRIs (e.g. https://ibm.com to https://ibm.com/), which
+the N-Triples writer leaves as they are.
+"""
+import heapq
+import os
+import shutil
+import tempfile
+
+from rdflib import Graph
+
+from .binary import stream_triples
+from .writers import TripleWriter
+
+
+def graph_lines(source, folder):
+    """N-Triples lines of a graph file, JSON-LD is parsed and written as N-Triples first."""
+    if source.endswith(".jsonld"):
+        g = Graph()
+        g.parse(source, format="json-ld")
+        nt_file = os.path.join(folder, "graph.nt")
+        writer = TripleWriter(nt_file)
+        for triple in g:
+            writer.add(triple)
+        writer.close()
+        source = nt_file
+    for triple in stream_triples(source):
+        yield " ".join(triple) + " .\n"
+
+def write_run(lines, folder, number):
+    lines.sort()
+    path = os.path.join(folder, "run{}.nt".format(number))
+    with open(path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.writelines(lines)
+    return path
+
+def sorted_lines(source, folder, run_lines=1000000):
+    """Yield the distinct lines of a graph file in sorted order, keeping at most run_lines in memory."""
+    return unique_sorted(graph_lines(source, folder), folder, run_lines)
+
+def unique_sorted(source_lines, folder, run_lines=1000000):
+    """Yield the distinct lines of an iterable in sorted order, sorted in runs of run_lines in folder."""
+    runs = []
+    lines = []
+    for line in source_lines:
+        lines.append(line)
+        if len(lines) >= run_lines:
+            runs.append(write_run(lines, folder, len(runs)))
+            lines = []
+    runs.append(write_run(lines, folder, len(runs)))
+    del lines
+
+    files = [open(run, 'r', encoding='utf-8', buffering=1 << 16) for run in runs]
+    try:
+        previous = None
+        for line in heapq.merge(*files):
+            if line != previous:
+                yield line
+                previous = line
+    finally:
+        for f in files:
+            f.close()
+
+def write_update(destination, removed_file, added_file, batch=10000):
+    """SPARQL Update deleting the lines of removed_file and inserting those of added_file, batch triples per operation."""
+    with open(destination, 'w', encoding='utf-8', buffering=1 << 20) as update:
+        for operation, filename in [("DELETE DATA", removed_file), ("INSERT DATA", added_file)]:
+            with open(filename, 'r', encoding='utf-8') as f:
+                n = 0
+                for line in f:
+                    if n % batch == 0:
+                        if n:
+                            update.write("} ;\n")
+                        update.write(operation + " {\n")
+                    update.write(line)
+                    n += 1
+                if n:
+                    update.write("} ;\n")
+
+def diff(old, new, destination, run_lines=1000000, batch=10000, tmp_dir=None):
+    """Write the changeset from the graph in old to the one in new to destination, returns the number of removed and added triples."""
+    folder = tempfile.mkdtemp(prefix="somesci-diff-", dir=tmp_dir)
+    try:
+        for name in ["old", "new"]:
+            os.makedirs(os.path.join(folder, name))
+        removed_file = os.path.join(folder, "removed.nt")
+        added_file = os.path.join(folder, "added.nt")
+        old_lines = sorted_lines(old, os.path.join(folder, "old"), run_lines)
+        new_lines = sorted_lines(new, os.path.join(folder, "new"), run_lines)
+        n_removed = n_added = 0
+        with open(removed_file, 'w', encoding='utf-8', buffering=1 << 20) as removed, \
+             open(added_file, 'w', encoding='utf-8', buffering=1 << 20) as added:
+            a = next(old_lines, None)
+            b = next(new_lines, None)
+            while a is not None or b is not None:
+                if b is None or (a is not None and a < b):
+                    removed.write(a)
+                    n_removed += 1
+                    a = next(old_lines, None)
+                elif a is None or b < a:
+                    added.write(b)
+                    n_added += 1
+                    b = next(new_lines, None)
+                else:
+                    a = next(old_lines, None)
+                    b = next(new_lines, None)
+        write_update(destination, removed_file, added_file, batch)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    return n_removed, n_added
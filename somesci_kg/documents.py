@@ -0,0 +1,141 @@
+"""Per-document JSON-LD records with an offset index, for serving single articles.
+
+The triples of every converted document are written as one compacted JSON-LD record
+(with the context of the graph) per line to an append-only file. The index file
+next to it (<file>.idx) has one line per record: document id, byte offset and
+length. DocumentStore loads the index and reads a document with one seek, without
+parsing anything else.
+"""
+import json
+import os
+import shutil
+
+from .diagnostics import Collector
+from .metadata import new_graph
+from .writers import jsonld_data
+
+
+def index_file(path):
+    return path + ".idx"
+
+def document_record(triples):
+    """Compacted JSON-LD of the triples of a document, as a {"@context", "@graph"} object on one line."""
+    g = new_graph()
+    for triple in triples:
+        g.add(triple)
+    data = jsonld_data(g)
+    if "@graph" not in data:
+        jsonld_context = data.pop("@context")
+        data = {"@context" : jsonld_context, "@graph" : [data]}
+    return json.dumps(data, sort_keys=True, ensure_ascii=False)
+
+
+class DocumentWriter(Collector):
+    """Appends document records to the store at path, which is created on the first record."""
+    def __init__(self):
+        super().__init__()
+        self.path = None
+        self.file = None
+        self.index = None
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def open(self, path):
+        self.close()
+        self.path = path
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.index.close()
+        self.file = self.index = None
+
+    def add(self, doc_id, triples):
+        if self.enabled:
+            self.emit(doc_id, document_record(triples))
+
+    def ensure_open(self):
+        if self.file is None:
+            self.file = open(self.path, 'wb')
+            self.index = open(index_file(self.path), 'w', encoding='utf-8')
+
+    def output(self, doc_id, record):
+        self.ensure_open()
+        data = (record + "\n").encode('utf-8')
+        self.index.write("{}\t{}\t{}\n".format(doc_id, self.file.tell(), len(data)))
+        self.file.write(data)
+
+    def append(self, path):
+        """Move the records of another store (e.g. of a shard) to the end of this one."""
+        self.ensure_open()
+        if not os.path.exists(path):
+            # no documents
+            return
+        base = self.file.tell()
+        with open(path, 'rb') as f:
+            shutil.copyfileobj(f, self.file, 1 << 20)
+        with open(index_file(path), 'r', encoding='utf-8') as f:
+            for line in f:
+                doc_id, offset, length = line.rstrip('\n').split('\t')
+                self.index.write("{}\t{}\t{}\n".format(doc_id, base + int(offset), length))
+        os.remove(path)
+        os.remove(index_file(path))
+
+documents = DocumentWriter()
+
+
+class DocumentStore:
+    """Random access to the records written by build --documents.
+
+        store = DocumentStore("somesci-documents.jsonl")
+        store.get("PMC2823230")     # {"@context" : ..., "@graph" : [...]}
+
+    A document id that was converted more than once (e.g. in several subsets) has
+    several records, get() joins their node lists.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.offsets = {}
+        with open(index_file(path), 'r', encoding='utf-8') as f:
+            for line in f:
+                doc_id, offset, length = line.rstrip('\n').split('\t')
+                self.offsets.setdefault(doc_id, []).append((int(offset), int(length)))
+        self.file = open(path, 'rb')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.file.close()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.offsets
+
+    def ids(self):
+        return list(self.offsets)
+
+    def records(self, doc_id):
+        """The records of a document as JSON strings, e.g. to send them on unparsed."""
+        records = []
+        for offset, length in self.offsets.get(doc_id, []):
+            self.file.seek(offset)
+            records.append(self.file.read(length).decode('utf-8').rstrip('\n'))
+        return records
+
+    def get(self, doc_id):
+        """The JSON-LD of a document, None if it is not in the store."""
+        records = [json.loads(record) for record in self.records(doc_id)]
+        if not records:
+            return None
+        data = records[0]
+        for record in records[1:]:
+            data["@graph"].extend(record["@graph"])
+        return data
@@ -0,0 +1,230 @@
+"""Index over the linking records in SoMeSci/Linking, loaded lazily.
+
+The records are either indexed in memory (LinkingIndex) or in a persistent 
+SQLite database (LinkingStore) that is only rebuilt when the JSON files change.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+
+
+# folder with the linking files, the index is loaded from it on first use
+path = 'SoMeSci/Linking'
+# SQLite database used instead of the in-memory index, None keeps the index in memory
+database = None
+_index = None
+
+
+class LinkingIndex:
+    """Hash index over the linking records in SoMeSci/Linking.
+
+    Software, developer and license records are keyed on 
+    (paper_id, sentence_id, mention, beg, end), citations on (paper_id, mention).
+    Lookups return all records for a key, so duplicates show up as ambiguous matches.
+    """
+    files = {
+        'software' : 'artifacts.json',
+        'developer' : 'developer.json',
+        'license' : 'license.json',
+        'citation' : 'citations.json'
+    }
+
+    def __init__(self):
+        self.records = {kind : {} for kind in self.files}
+        self.sentences = {kind : set() for kind in self.files}
+        self.papers = {}
+
+    @classmethod
+    def from_folder(cls, path):
+        index = cls()
+        for kind, filename in cls.files.items():
+            with open(os.path.join(path, filename), 'r') as f:
+                for record in json.load(f):
+                    index.add(kind, record)
+        return index
+
+    @staticmethod
+    def key(kind, record):
+        if kind == 'citation':
+            return (record['paper_id'], record['mention'])
+        return (record['paper_id'], record['sentence_id'], record['mention'], record['beg'], record['end'])
+
+    def add(self, kind, record):
+        self.records[kind].setdefault(self.key(kind, record), []).append(record)
+        self.papers.setdefault(record['paper_id'], []).append((kind, record))
+        if kind != 'citation':
+            self.sentences[kind].add((record['paper_id'], record['sentence_id']))
+
+    def has_sentence(self, kind, paper_id, sentence_id):
+        return (paper_id, sentence_id) in self.sentences[kind]
+
+    def lookup(self, kind, *key):
+        return self.records[kind].get(key, [])
+
+    def citation_links(self, paper_id, mention):
+        """Links of a citation mention, None if the mention is unknown. Later records win, as in citations.json."""
+        records = self.records['citation'].get((paper_id, mention))
+        if not records:
+            return None
+        return records[-1]['links']
+
+    def paper_records(self, paper_id):
+        """All (kind, record) pairs of a paper, in file order."""
+        return self.papers.get(paper_id, [])
+
+    def ambiguous(self, kind=None):
+        """All keys (per kind) that match more than one record."""
+        kinds = [kind] if kind else self.files.keys()
+        return {k : [key for key, records in self.records[k].items() if len(records) > 1] for k in kinds}
+
+
+class LinkingStore:
+    """LinkingIndex compatible queries on a SQLite database compiled from the linking files.
+
+    The database keeps the size, modification time and hash of the JSON files it was 
+    built from and is rebuilt by open() whenever one of them changed. Every process 
+    uses its own connection, so a store can be shared with forked workers.
+    """
+    files = LinkingIndex.files
+
+    schema = """
+        CREATE TABLE sources (file TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, sha256 TEXT);
+        CREATE TABLE records (
+            kind TEXT NOT NULL, paper_id TEXT NOT NULL, sentence_id INTEGER, mention TEXT NOT NULL,
+            beg INTEGER, "end" INTEGER, position INTEGER NOT NULL, record TEXT NOT NULL);
+    """
+    indexes = """
+        CREATE INDEX records_key ON records (kind, paper_id, sentence_id, mention, beg, "end");
+        CREATE INDEX records_paper ON records (paper_id, position);
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._conn = None
+        self._pid = None
+
+    @classmethod
+    def open(cls, db_path, folder):
+        """Open the store at db_path, (re)building it first if the files in folder changed."""
+        store = cls(db_path)
+        if not store.is_current(folder):
+            store.rebuild(folder)
+        return store
+
+    @property
+    def conn(self):
+        if self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.db_path)
+            self._pid = os.getpid()
+        return self._conn
+
+    @staticmethod
+    def file_hash(filename):
+        h = hashlib.sha256()
+        with open(filename, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        return h.hexdigest()
+
+    def is_current(self, folder):
+        if not os.path.exists(self.db_path):
+            return False
+        try:
+            sources = {row[0] : row[1:] for row in self.conn.execute("SELECT file, size, mtime, sha256 FROM sources")}
+        except sqlite3.DatabaseError:
+            return False
+        for filename in self.files.values():
+            fn = os.path.join(folder, filename)
+            if filename not in sources:
+                return False
+            size, mtime, sha256 = sources[filename]
+            stat = os.stat(fn)
+            if (stat.st_size, stat.st_mtime_ns) == (size, mtime):
+                continue
+            # touched, but maybe not changed
+            if stat.st_size != size or self.file_hash(fn) != sha256:
+                return False
+            with self.conn:
+                self.conn.execute("UPDATE sources SET mtime = ? WHERE file = ?", (stat.st_mtime_ns, filename))
+        return True
+
+    def rebuild(self, folder):
+        """Compile the linking files of folder into a new database and replace the old one with it."""
+        tmp_path = "{}.{}.tmp".format(self.db_path, os.getpid())
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        conn = sqlite3.connect(tmp_path)
+        conn.executescript(self.schema)
+        with conn:
+            for kind, filename in self.files.items():
+                fn = os.path.join(folder, filename)
+                stat = os.stat(fn)
+                with open(fn, 'r') as f:
+                    records = json.load(f)
+                conn.executemany("INSERT INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (
+                    (kind, r['paper_id'], r.get('sentence_id'), r['mention'], r.get('beg'), r.get('end'), position, json.dumps(r))
+                    for position, r in enumerate(records)))
+                conn.execute("INSERT INTO sources VALUES (?, ?, ?, ?)", (filename, stat.st_size, stat.st_mtime_ns, self.file_hash(fn)))
+        # indexes are faster to create after the bulk insert
+        conn.executescript(self.indexes)
+        conn.close()
+        if self._conn is not None:
+            self._conn.close()
+            self._pid = None
+        os.replace(tmp_path, self.db_path)
+
+    def has_sentence(self, kind, paper_id, sentence_id):
+        return self.conn.execute("SELECT 1 FROM records WHERE kind = ? AND paper_id = ? AND sentence_id = ? LIMIT 1", 
+                                 (kind, paper_id, sentence_id)).fetchone() is not None
+
+    def lookup(self, kind, *key):
+        if kind == 'citation':
+            paper_id, mention = key
+            rows = self.conn.execute("SELECT record FROM records WHERE kind = ? AND paper_id = ? AND sentence_id IS NULL AND mention = ? ORDER BY position", 
+                                     (kind, paper_id, mention))
+        else:
+            rows = self.conn.execute('SELECT record FROM records WHERE kind = ? AND paper_id = ? AND sentence_id = ? AND mention = ? AND beg = ? AND "end" = ? ORDER BY position', 
+                                     (kind,) + key)
+        return [json.loads(row[0]) for row in rows]
+
+    def citation_links(self, paper_id, mention):
+        """Links of a citation mention, None if the mention is unknown. Later records win, as in citations.json."""
+        records = self.lookup('citation', paper_id, mention)
+        if not records:
+            return None
+        return records[-1]['links']
+
+    def paper_records(self, paper_id):
+        """All (kind, record) pairs of a paper, in file order."""
+        kinds = list(self.files)
+        rows = self.conn.execute("SELECT kind, record FROM records WHERE paper_id = ? ORDER BY position", (paper_id,))
+        return sorted(((kind, json.loads(record)) for kind, record in rows), key=lambda r: kinds.index(r[0]))
+
+    def ambiguous(self, kind=None):
+        """All keys (per kind) that match more than one record."""
+        kinds = [kind] if kind else self.files.keys()
+        result = {}
+        for k in kinds:
+            rows = self.conn.execute('SELECT paper_id, sentence_id, mention, beg, "end" FROM records WHERE kind = ? '
+                                     'GROUP BY paper_id, sentence_id, mention, beg, "end" HAVING count(*) > 1 ORDER BY min(position)', (k,))
+            result[k] = [(row[0], row[2]) if k == 'citation' else tuple(row) for row in rows]
+        return result
+
+
+def load(folder=None):
+    """Load the index from folder (default: path) and keep it for get_index().
+
+    Uses the LinkingStore at database instead of the in-memory index if it is set.
+    """
+    global _index
+    if database is not None:
+        _index = LinkingStore.open(database, folder or path)
+    else:
+        _index = LinkingIndex.from_folder(folder or path)
+    return _index
+
+def get_index():
+    if _index is None:
+        load()
+    return _index
@@ -0,0 +1,177 @@
+"""Vocabulary of the knowledge graph and the mapping of annotation labels onto it."""
+
+
+# URLs for used vocabulary
+context = {
+        "@vocab" : "http://schema.org/",
+        "@base" : "http://data.gesis.org/somesci/",
+        "sms" : "http://data.gesis.org/somesci/",
+        "nif" : "http://persistence.uni-leipzig.org/nlp2rdf/ontologies/nif-core#",
+        "wd" : "http://www.wikidata.org/entity/",
+        "its": "http://www.w3.org/2005/11/its/rdf#",
+        "xsd": "http://www.w3.org/2001/XMLSchema#",
+        "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+        "prov" : "http://www.w3.org/TR/prov-o/#",
+        "comment": "http://www.w3.org/2000/01/rdf-schema#comment",
+        "void": "http://rdfs.org/ns/void#",
+        "dcterms" : "http://purl.org/dc/terms/",
+        "foaf": "http://xmlns.com/foaf/0.1/",
+        "schema" : "http://schema.org/",
+        "dcat" : "http://www.w3.org/ns/dcat#"
+    }
+
+
+
+keywords = ["Scientific Articles","Corpus", "Software Mention","Named Entity Recognition","Relation Extraction","Entity Disambiguation","Entity Linking"]
+
+# Mapping from software labels to KG class label
+software = { 
+    'Application' : 'sms:Application', # software
+    'PlugIn' : 'sms:PlugIn', # plug-in
+    'ProgrammingEnvironment' : 'sms:ProgrammingEnvironment', # programming language
+    'OperatingSystem' : 'sms:OperatingSystem', # operating system
+#    'web' : 'wd:Q193424', #web service 
+    'depositionstatment' : 'sms:SoftwareCoreference', #coreference
+}
+
+# Mapping from mention labels to KG mention class types
+mention = {
+    'usage' : 'sms:Usage', # use
+    'creation' : 'sms:Creation', # software development
+    'allusion' : 'sms:Allusion', # allusion
+    'deposition' : 'sms:Deposition', # publication
+}
+
+# Mapping of mixed annotation types to multiple types    
+entity_map = {'Application_Usage' : [software['Application'], mention['usage'] ],
+            'Application_Creation' : [software['Application'],mention['creation']],
+            'Application_Mention' : [software['Application'],mention['allusion'] ],
+            'Application_Deposition' : [software['Application'],mention['deposition']],
+            
+            'OperatingSystem_Usage' : [ software['OperatingSystem'],mention['usage']],
+            'OperatingSystem_Creation' : [ software['OperatingSystem'],mention['creation']],
+            'OperatingSystem_Mention' : [ software['OperatingSystem'],mention['allusion']],
+            'OperatingSystem_Deposition' : [ software['OperatingSystem'],mention['deposition']],
+            
+            'ProgrammingEnvironment_Usage' : [ software['ProgrammingEnvironment'],mention['usage']],
+            'ProgrammingEnvironment_Creation' : [ software['ProgrammingEnvironment'],mention['creation']],
+            'ProgrammingEnvironment_Mention' : [ software['ProgrammingEnvironment'],mention['allusion']],
+            'ProgrammingEnvironment_Deposition' : [ software['ProgrammingEnvironment'],mention['deposition']],
+            
+            'PlugIn_Usage' : [ software['PlugIn'],mention['usage']],
+            'PlugIn_Creation' : [ software['PlugIn'], mention['creation']],
+            'PlugIn_Mention' : [ software['PlugIn'], mention['allusion']],
+            'PlugIn_Deposition' : [ software['PlugIn'],mention['deposition']],
+
+           # 'web_usage' : [ software['web'],mention['usage']],
+           # 'web_creation' : [ software['web'], mention['creation']],
+           # 'web_mention' : [software['web'], mention['allusion']],
+           # 'web_deposition' : [ software['web'], mention['deposition']],
+
+            'SoftwareCoreference_Deposition' : [software['depositionstatment'], mention['deposition']],
+
+            'Abbreviation' : ['sms:Abbreviation'], # abbreviation
+            'Developer' : ['sms:Developer'], #publisher
+            'Extension' : ['sms:Extension'], # special edition
+            'AlternativeName' : ['sms:AlternativeName'], 
+            'Citation' : ['sms:Citation'], # reference
+            'Release' : ['sms:Release'], # software release
+            'URL' : ['sms:URL'], # Uniform Resource Locator
+            'Version' : ['sms:Version'], # software version
+            'License' : ['sms:License'] # licence
+}
+
+phrase_map = {'Application_Usage' : "nif:Phrase",
+            'Application_Creation' : "nif:Phrase",
+            'Application_Mention' : "nif:Phrase",
+            'Application_Deposition' : "nif:Phrase",
+            
+            'OperatingSystem_Usage' : "nif:Phrase",
+            'OperatingSystem_Creation' : "nif:Phrase",
+            'OperatingSystem_Mention' : "nif:Phrase",
+            'OperatingSystem_Deposition' : "nif:Phrase",
+            
+            'ProgrammingEnvironment_Usage' : "nif:Phrase",
+            'ProgrammingEnvironment_Creation' : "nif:Phrase",
+            'ProgrammingEnvironment_Mention' : "nif:Phrase",
+            'ProgrammingEnvironment_Deposition' : "nif:Phrase",
+            
+            'PlugIn_Usage' : "nif:Phrase",
+            'PlugIn_Creation' : "nif:Phrase",
+            'PlugIn_Mention' : "nif:Phrase",
+            'PlugIn_Deposition' : "nif:Phrase",
+
+           # 'web_usage' : [ software['web'],mention['usage']],
+           # 'web_creation' : [ software['web'], mention['creation']],
+           # 'web_mention' : [software['web'], mention['allusion']],
+           # 'web_deposition' : [ software['web'], mention['deposition']],
+
+            'SoftwareCoreference_Deposition' : "nif:Phrase",
+
+            'Abbreviation' : 'nif:Phrase', # abbreviation
+            'Developer' : 'nif:Phrase', #publisher
+            'Extension' : 'nif:Phrase', # special edition
+            'AlternativeName' : 'nif:Phrase', 
+            'Citation' : 'nif:Phrase', # reference
+            'Release' : 'nif:Phrase', # software release
+            'URL' : 'nif:Phrase', # Uniform Resource Locator
+            'Version' : 'nif:Phrase', # software version
+            'License' : 'nif:Phrase' # licence
+}
+
+# mapping of relations to wikidata properties
+# note that relations are inverted here
+relation_map = {
+            'Abbreviation_of' : 'sms:refersTo',
+            'Developer_of' : 'sms:refersTo',
+            'Extension_of' : 'sms:refersTo',
+            'AlternativeName_of' : 'sms:refersTo', # official name
+            'PlugIn_of' : 'sms:refersTo',
+            'Citation_of' : 'sms:refersTo',
+            'Release_of' : 'sms:refersTo',
+            'Specification_of' : 'sms:refersTo',
+            'URL_of' : 'sms:refersTo', # URL
+            'Version_of' : 'sms:refersTo', # software version identifier
+            'License_of' : 'sms:refersTo'
+}
+
+inv_relation_map = {
+            'Abbreviation_of' : 'sms:referredToByAbbreviation',
+            'Developer_of' : 'sms:referredToByDeveloper',
+            'Extension_of' : 'sms:referredToByExtension',
+            'AlternativeName_of' : 'sms:referredToByAlternativeName', # official name
+            'PlugIn_of' : 'sms:referredToByPlugIn',
+            'Citation_of' : 'sms:referredToByCitation',
+            'Release_of' : 'sms:referredToByRelease',
+            'Specification_of' : 'sms:referredToBySpecification',
+            'URL_of' : 'sms:referredToByURL', # URL
+            'Version_of' : 'sms:referredToByVersion', # software version identifier
+            'License_of' : 'sms:referredToByLicense'
+}
+
+link_entities = [
+    #"abbreviation",
+    "Developer",
+    "License",
+    "URL",
+    'Application_Usage',
+    'Application_Creation',
+    'Application_Mention',
+    'Application_Deposition',
+            
+    'OperatingSystem_Usage',
+    'OperatingSystem_Creation',
+    'OperatingSystem_Mention',
+    'OperatingSystem_Deposition',
+    
+    'ProgrammingEnvironment_Usage',
+    'ProgrammingEnvironment_Creation',
+    'ProgrammingEnvironment_Mention',
+    'ProgrammingEnvironment_Deposition',
+            
+    'PlugIn_Usage',
+    'PlugIn_Creation',
+    'PlugIn_Mention',
+    'PlugIn_Deposition',
+    "Citation"
+]
@@ -0,0 +1,112 @@
+"""Dataset level nodes: the SoMeSci dataset, its subsets and creators."""
+from rdflib import Graph, URIRef, Literal
+from rdflib.namespace import XSD, RDF
+from rdflib.plugins.memory import Memory
+
+from .mappings import context, keywords
+
+
+# subsets of the dataset
+dataset = URIRef("./")
+methods_dataset = URIRef("PLoS_Methods")
+sentences_dataset = URIRef("PLoS_sentences")
+pubmed_dataset = URIRef("Pubmed_fulltexts")
+creation_dataset = URIRef("Creation_sentences")
+
+# corpus folder and dataset node of each subset, in build order
+subsets = {
+    'PLoS_sentences' : sentences_dataset,
+    'PLoS_methods' : methods_dataset,
+    'Pubmed_fulltext' : pubmed_dataset,
+    'Creation_sentences' : creation_dataset,
+}
+
+
+def new_graph():
+    """Empty in-memory Graph that keeps the values of a subject in the order they were added.
+
+    The default store draws random ids for its terms, which decide the order of the 
+    values in the JSON-LD output (see writers.write_jsonld), the Memory store does not.
+    """
+    return Graph(store=Memory())
+
+def metadata_graph():
+    """Graph with the dataset meta data, its subsets and creators."""
+    g = new_graph()
+
+
+    # add dataset meta data
+    g.add((dataset, RDF.type, URIRef("void:Dataset")))
+    g.add((dataset, RDF.type, URIRef("dcat:Resource")))
+    g.add((dataset,URIRef("dcterms:license"), URIRef("https://creativecommons.org/licenses/by/4.0/")))
+    g.add((dataset, URIRef("dcterms:title"), Literal("SoMeSci")))
+    g.add((dataset, URIRef("dcterms:description"), Literal("A 5 Star Open Data Goldstand Corpus of Software Mentions in Scientific Articles")))
+    for k in keywords:
+        g.add((dataset, URIRef("dcat:keyword"), Literal(k)))
+    g.add((dataset, URIRef("dcat:landingPage"), URIRef("https://data.gesis.org/somesci/")))
+    g.add((dataset, URIRef("dcat:contactPoint"), URIRef("https://data.gesis.org/somesci/index.html#contact")))
+
+    for _,v in context.items():
+        g.add((dataset, URIRef("void:vocabulary"), Literal(v)))
+
+    g.add((dataset, URIRef("void:feature"), URIRef("http://www.w3.org/ns/formats/JSON-LD")))
+    g.add((dataset, URIRef("void:sparqlEndpoint"), URIRef("https://data.gesis.org/somesci/sparql")))
+    g.add((dataset, URIRef("dcterms:issued"), Literal("2021-06-16T24:00:00",datatype=XSD.dateTime)))
+
+
+      
+
+
+    # Add parts of the datasets
+    g.add((methods_dataset, RDF.type, URIRef("void:Dataset")))
+    g.add((methods_dataset, URIRef("dcterms:title"),Literal("PLoS methods")))
+    g.add((methods_dataset, URIRef("prov:wasDerivedFrom"), URIRef("https://doi.org/10.5281/zenodo.3715147")))
+    g.add((methods_dataset, URIRef("dcterms:description"),Literal("Contains methods sections from PLoS articles")))
+    g.add((dataset, URIRef("void:subset"), methods_dataset))
+
+
+    g.add((sentences_dataset, RDF.type, URIRef("void:Dataset")))
+    g.add((sentences_dataset, URIRef("dcterms:title"),Literal("PLoS sentences")))
+    g.add((sentences_dataset, URIRef("prov:wasDerivedFrom"), URIRef("https://doi.org/10.5281/zenodo.3715147")))
+    g.add((sentences_dataset, URIRef("dcterms:description"),Literal("Contains individual sentences with software mentions from PLoS articles")))
+    g.add((dataset, URIRef("void:subset"), sentences_dataset))
+
+
+    g.add((pubmed_dataset, RDF.type, URIRef("void:Dataset")))
+    g.add((pubmed_dataset, URIRef("dcterms:title"),Literal("Pubmed fulltexts")))
+    g.add((pubmed_dataset, URIRef("dcterms:description"),Literal("Contains fulltext articles randomly sampled from Pubmed Central")))
+    g.add((dataset, URIRef("void:subset"), pubmed_dataset))
+
+
+    g.add((creation_dataset, RDF.type, URIRef("void:Dataset")))
+    g.add((creation_dataset, URIRef("dcterms:title"),Literal("Creation Sentences")))
+    g.add((creation_dataset, URIRef("dcterms:description"),Literal("Contains individual sentences with statements about the creation of software from Pubmed Central articles")))
+    g.add((dataset, URIRef("void:subset"), creation_dataset))
+
+
+    g.add((dataset, URIRef("dcterms:creator"),URIRef("https://www.orcid.org/0000-0003-4203-8851")))
+    g.add((URIRef("https://www.orcid.org/0000-0003-4203-8851"), RDF.type, URIRef("foaf:Person")))
+    g.add((URIRef("https://www.orcid.org/0000-0003-4203-8851"), URIRef("foaf:name"), Literal("David Schindler")))
+    g.add((URIRef("https://www.orcid.org/0000-0003-4203-8851"), URIRef("foaf:mbox"), Literal("mailto:david.schindler@uni-rostock.de")))
+    g.add((URIRef("https://www.orcid.org/0000-0003-4203-8851"), URIRef("schema:organisation"), URIRef("https://ror.org/03zdwsf69")))
+
+    g.add((dataset, URIRef("dcterms:creator"),URIRef("creator3")))
+    g.add((URIRef("creator3"), RDF.type, URIRef("foaf:Person")))
+    g.add((URIRef("creator3"), URIRef("foaf:name"), Literal("Stefan Dietze")))
+    g.add((URIRef("creator3"), URIRef("foaf:mbox"), Literal("stefan.dietze@gesis.org")))
+    g.add((URIRef("creator3"), URIRef("schema:organisation"), URIRef("https://ror.org/018afyw53")))
+    g.add((URIRef("creator3"), URIRef("schema:organisation"), URIRef("https://ror.org/024z2rq82")))
+
+    g.add((dataset, URIRef("dcterms:creator"),URIRef("creator2")))
+    g.add((URIRef("creator2"), RDF.type, URIRef("foaf:Person")))
+    g.add((URIRef("creator2"), URIRef("foaf:name"), Literal("Felix Bensmann")))
+    g.add((URIRef("creator2"), URIRef("foaf:mbox"), Literal("felix.bensmann@gesis.org")))
+    g.add((URIRef("creator2"), URIRef("schema:organisation"), URIRef("https://ror.org/018afyw53")))
+
+
+    g.add((dataset, URIRef("dcterms:creator"),URIRef("https://www.orcid.org/0000-0002-7925-3363")))
+    g.add((URIRef("https://www.orcid.org/0000-0002-7925-3363"), RDF.type, URIRef("foaf:Person")))
+    g.add((URIRef("https://www.orcid.org/0000-0002-7925-3363"), URIRef("foaf:name"), Literal("Frank Krüger")))
+    g.add((URIRef("https://www.orcid.org/0000-0002-7925-3363"), URIRef("foaf:mbox"), Literal("frank.krueger@uni-rostock.de")))
+    g.add((URIRef("https://www.orcid.org/0000-0002-7925-3363"), URIRef("schema:organisation"), URIRef("https://ror.org/03zdwsf69")))
+    return g
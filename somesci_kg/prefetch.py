@@ -0,0 +1,32 @@
+"""Reading the .txt/.ann pairs of upcoming documents while the current one is converted."""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+
+def read_document(filename):
+    """Text and brat annotation of the document."""
+    with open(filename, 'r') as text_file, open(os.path.splitext(filename)[0] + ".ann", 'r') as ann_file:
+        return text_file.read(), ann_file.read()
+
+def prefetch(jobs, depth=16, threads=8):
+    """Yield (job, (text, annotation)) for (filename, sub_dataset) jobs in their order.
+
+    Up to depth documents are read ahead on a thread pool, which hides the latency
+    of slow (network) storage. depth bounds the number of documents held in memory,
+    with 0 every document is read when it is needed.
+    """
+    if depth <= 0:
+        for job in jobs:
+            yield job, read_document(job[0])
+        return
+    with ThreadPoolExecutor(min(threads, depth)) as pool:
+        pending = deque()
+        for job in jobs:
+            pending.append((job, pool.submit(read_document, job[0])))
+            if len(pending) >= depth:
+                job, contents = pending.popleft()
+                yield job, contents.result()
+        while pending:
+            job, contents = pending.popleft()
+            yield job, contents.result()
@@ -0,0 +1,161 @@
+"""Section offsets of the documents from their NXML or .src files.
+
+Section maps are lists of {'Title' : title, 'Begin' : offset, 'End' : offset} in document
+order, with character offsets into the document text. They are read in a streaming fashion, so that long
+articles are never loaded as a whole, and cached next to the document fragments.
+"""
+from functools import partial
+from itertools import zip_longest
+import hashlib
+import json
+import os
+
+from .diagnostics import warning
+
+
+# section maps are only added to the graph if enabled, NXML files are looked up
+# in xml_folder/<subset>/<id>.nxml, .src files next to the .txt files
+enabled = False
+xml_folder = None
+cache_dir = None
+cache_version = 2
+
+
+def text_length(filename):
+    """Number of characters of a text file, read in chunks."""
+    with open(filename, 'r') as f:
+        return sum(len(chunk) for chunk in iter(partial(f.read, 1 << 16), ''))
+
+def top_level_titles(xml_file):
+    """Titles of the sections matched by //body/sec/title, using iterparse instead of parsing the whole tree."""
+    from lxml import etree
+
+    titles = []
+    path = []
+    for event, element in etree.iterparse(xml_file, events=("start", "end")):
+        if event == "start":
+            path.append(element.tag)
+            continue
+        if path[-3:] == ["body", "sec", "title"]:
+            titles.append("".join(element.itertext()))
+        path.pop()
+        if element.tag == "body":
+            # back matter has no sections of interest
+            break
+        if path[-1:] == ["title"]:
+            # markup within a title is part of its text
+            continue
+        # free what was already looked at, only the elements on the current path are kept
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+    return titles
+
+def methods_section_from_xml(filename, xml_file):
+    """Section map of a document (e.g. of PLoS methods) that consists of the methods section of the article in xml_file."""
+    from .convert import document_ids
+
+    doc_id = document_ids(filename)[1]
+    sec_titles = [t for t in top_level_titles(xml_file) if "method" in t.lower()]
+    if len(set(sec_titles)) != 1: #exact 1 methods sections, or at least all with the same name
+        warning("section", "No unique methods ({}, {}) section found in {}".format(len(sec_titles), sec_titles, xml_file), doc_id)
+        return None
+    return [{'Title' : sec_titles[0], 'Begin' : 0, 'End' : text_length(filename)}]
+
+def sections_from_src(filename, src_file):
+    """Section map from a .src file, which names the section of every line of the text file.
+
+    Every run of lines with the same name is a section of its own, also if the name 
+    was used by an earlier section.
+    """
+    from .convert import document_ids
+
+    doc_id = document_ids(filename)[1]
+    sections = []
+    n_txt = n_src = 0
+    cursor = 0
+    current = None
+    with open(filename, 'r') as txt, open(src_file, 'r') as src:
+        for txt_line, src_line in zip_longest(txt, src):
+            n_txt += txt_line is not None
+            n_src += src_line is not None
+            if txt_line is None or src_line is None:
+                continue
+            title = src_line.strip()
+            if title != current:
+                sections.append({'Title' : title, 'Begin' : cursor, 'End' : cursor})
+                current = title
+            sections[-1]['End'] = cursor + len(txt_line.rstrip('\n'))
+            cursor += len(txt_line)
+    if n_txt != n_src:
+        warning("section", "Length of file do not match ({}:{}) for {}".format(n_txt, n_src, filename), doc_id)
+        return None
+    return sections
+
+def methods_titles_from_xml(files, xml_folder):
+    sections = {}
+    for filename in files:
+        id = os.path.splitext(os.path.basename(filename))[0]
+        doc_sections = methods_section_from_xml(filename, os.path.join(xml_folder, id + ".nxml"))
+        if doc_sections is not None:
+            sections[id] = doc_sections
+    return sections
+
+def methods_from_src(files):
+    sections = {}
+    for filename in files:
+        id = os.path.splitext(os.path.basename(filename))[0]
+        sections[id] = sections_from_src(filename, os.path.splitext(filename)[0] + '.src') or []
+    return sections
+
+
+def source_files(filename):
+    """The .src and .nxml file a section map of the document can be read from (either may be None)."""
+    src_file = os.path.splitext(filename)[0] + '.src'
+    xml_file = None
+    if xml_folder is not None:
+        subset = os.path.basename(os.path.dirname(filename))
+        xml_file = os.path.join(xml_folder, subset, os.path.splitext(os.path.basename(filename))[0] + ".nxml")
+    return [fn if fn is not None and os.path.exists(fn) else None for fn in (src_file, xml_file)]
+
+def sources_key(filename):
+    """Key of the section map of a document: its text and source files with their sizes and modification times."""
+    stamps = [cache_version]
+    for fn in [filename] + source_files(filename):
+        stat = os.stat(fn) if fn is not None else None
+        stamps.append([fn, stat.st_size, stat.st_mtime_ns] if stat else None)
+    return hashlib.sha256(json.dumps(stamps).encode()).hexdigest()
+
+def document_sections(filename):
+    """Section map of a document, empty if sections are not enabled or there is no source for them.
+
+    A .src file takes precedence over the NXML file. With a cache_dir, maps are only 
+    read again if the text or source files changed. Maps that could not be read are 
+    not cached, so their warnings are raised again.
+    """
+    if not enabled:
+        return []
+    src_file, xml_file = source_files(filename)
+    if src_file is None and xml_file is None:
+        return []
+    if cache_dir is not None:
+        key = sources_key(filename)
+        path = os.path.join(cache_dir, "sections", key[:2], key + ".json")
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    if src_file is not None:
+        sections = sections_from_src(filename, src_file)
+    else:
+        sections = methods_section_from_xml(filename, xml_file)
+    if sections is None:
+        return []
+    if cache_dir is not None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(tmp_path, 'w') as f:
+            json.dump(sections, f)
+        os.replace(tmp_path, path)
+    return sections
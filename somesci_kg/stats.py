@@ -0,0 +1,130 @@
+"""Aggregate counts of the converted corpus, accumulated while the documents are converted.
+
+The counts answer the common questions about the graph (mentions per software
+identity, class, mention type and subset, relations per label) without a SPARQL
+aggregation over the whole graph. They are written as JSON and as VoID class and
+property partitions of the dataset.
+"""
+from collections import Counter
+import json
+import os
+import shutil
+import tempfile
+from urllib.parse import quote
+
+from rdflib import URIRef, Literal
+from rdflib.namespace import RDF
+
+from .binary import stream_triples
+from .diagnostics import Collector
+from .diff import unique_sorted
+from .mappings import context
+from .metadata import dataset
+from .terms import its_taIdentRef, relation_predicates, inv_relation_predicates
+from .writers import expand_iri
+
+
+class BuildStatistics(Collector):
+    """Counters by name and key, e.g. statistics.count('classes', 'sms:Application').
+
+    Counters: documents, sentences and mentions per subset, nodes per rdf:type class 
+    (types), mentions per class (its:taClassRef), per software identity (its:taIdentRef 
+    of software mentions), relations and inverse_relations per relation label, links 
+    (its:taIdentRef triples) and unmatched mentions per kind of linking file.
+    Counts that are collected are summed per counter.
+    """
+    names = ['documents', 'sentences', 'mentions', 'types', 'classes', 'identities', 'relations', 'inverse_relations', 'links', 'unmatched']
+
+    def __init__(self):
+        super().__init__()
+        self.counters = {name : Counter() for name in self.names}
+
+    def count(self, name, key, n=1):
+        self.emit(name, key, n)
+
+    def collection(self):
+        return {}
+
+    def divert(self, name, key, n):
+        self.collected.setdefault(name, Counter())[key] += n
+
+    def output(self, name, key, n):
+        self.counters[name][key] += n
+
+    def replay(self, counts):
+        for name, counter in counts.items():
+            for key, n in counter.items():
+                self.emit(name, key, n)
+
+    def as_dict(self):
+        return {name : dict(self.counters[name].most_common()) for name in self.names}
+
+    def write(self, destination):
+        with open(destination, 'w') as f:
+            json.dump(self.as_dict(), f, indent=1, ensure_ascii=False)
+
+    def partition_triples(self):
+        """void:classPartition and void:propertyPartition triples of the dataset, every partition with its own IRI.
+
+        Class partitions count the nodes of every rdf:type, the its:taClassRef classes of 
+        the mentions are no rdf:type and are only written to the JSON. Relation labels that 
+        share a predicate (e.g. sms:refersTo) are summed into the partition of that predicate.
+        """
+        classes = [(URIRef(c), n) for c, n in sorted(self.counters['types'].items())]
+        property_counts = Counter()
+        for label, n in self.counters['relations'].items():
+            property_counts[relation_predicates[label]] += n
+        for label, n in self.counters['inverse_relations'].items():
+            property_counts[inv_relation_predicates[label]] += n
+        property_counts[its_taIdentRef] += sum(self.counters['links'].values())
+        properties = sorted(property_counts.items())
+
+        for kind, partitions, of, size in [("classPartition", classes, "void:class", "void:entities"),
+                                           ("propertyPartition", properties, "void:property", "void:triples")]:
+            for term, n in partitions:
+                if not n:
+                    continue
+                node = URIRef("statistics/{}/{}".format(kind, quote(term.replace(':', '_'), safe='')))
+                yield (dataset, URIRef("void:" + kind), node)
+                yield (node, RDF.type, URIRef("void:Dataset"))
+                yield (node, URIRef(of), term)
+                yield (node, URIRef(size), Literal(n))
+
+statistics = BuildStatistics()
+
+
+def void_counts(source, run_lines=1000000, tmp_dir=None):
+    """void:triples, void:entities and void:distinctSubjects of an N-Triples/N-Quads file.
+
+    Triples are counted once, even if written more often. Entities are the distinct 
+    IRIs within the SoMeSci namespace (the @base of the context), i.e. documents, 
+    sentences, mentions and so on, but not the linked Wikidata items or vocabulary 
+    terms. The triples and entities are sorted on disk like in diff, so that memory 
+    use does not grow with the file.
+    """
+    folder = tempfile.mkdtemp(prefix="somesci-void-", dir=tmp_dir)
+    try:
+        for name in ["triples", "entities"]:
+            os.makedirs(os.path.join(folder, name))
+        n_triples = n_subjects = 0
+        subject = None
+        triples = (" ".join(triple) + "\n" for triple in stream_triples(source))
+        # the lines of a subject are next to each other once sorted
+        for line in unique_sorted(triples, os.path.join(folder, "triples"), run_lines):
+            n_triples += 1
+            s = line.split(" ", 1)[0]
+            if s != subject:
+                n_subjects += 1
+                subject = s
+        base = "<" + context['@base']
+        entities = (term + "\n" for s, _, o in stream_triples(source) for term in (s, o) if term.startswith(base))
+        n_entities = sum(1 for _ in unique_sorted(entities, os.path.join(folder, "entities"), run_lines))
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    return {'void:triples' : n_triples, 'void:entities' : n_entities, 'void:distinctSubjects' : n_subjects}
+
+def graph_void_counts(g):
+    """void_counts() of a graph in memory."""
+    entities = {term for s, _, o in g for term in (s, o) 
+                if isinstance(term, URIRef) and expand_iri(term).startswith(context['@base'])}
+    return {'void:triples' : len(g), 'void:entities' : len(entities), 'void:distinctSubjects' : len(set(g.subjects()))}
@@ -0,0 +1,280 @@
+"""Disk-backed rdflib store for graphs that do not fit into memory, and local queries on it.
+
+Triples are dictionary encoded into a SQLite database: every term (in N-Triples
+syntax, compact and relative IRIs expanded) is stored once in the terms table,
+the triples table only holds their ids. Added triples are buffered and written
+in batches of one transaction each. The same database is written by build --store
+and by load(), and can be queried without an endpoint, e.g. for the mentions of
+a class or identity.
+"""
+from functools import lru_cache
+import json
+import os
+import sqlite3
+
+from rdflib import BNode, Graph
+from rdflib.store import Store
+
+from .binary import decode, stream_triples
+from .mappings import context
+from .terms import its_taClassRef, its_taIdentRef, nif_anchorOf, nif_referenceContext
+from .writers import nt_term
+
+
+@lru_cache(maxsize=1 << 16)
+def encode(term):
+    if isinstance(term, BNode):
+        return "_:" + term
+    return nt_term(term)
+
+@lru_cache(maxsize=1 << 16)
+def decode_term(term):
+    if term.startswith("_:"):
+        return BNode(term[2:])
+    return decode(term)
+
+
+class TripleStore(Store):
+    """rdflib store on a SQLite database, use it as Graph(store=TripleStore(path)).
+
+    Triples are buffered and written batch at a time (commit() writes them
+    earlier), queries and len() write the buffer first. The database keeps
+    the triples when closed and can be opened again, with create it is
+    replaced. Named graphs are not kept apart.
+    """
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS terms (id INTEGER PRIMARY KEY, term TEXT NOT NULL UNIQUE);
+        CREATE TABLE IF NOT EXISTS triples (s INTEGER NOT NULL, p INTEGER NOT NULL, o INTEGER NOT NULL,
+                                            PRIMARY KEY (s, p, o)) WITHOUT ROWID;
+    """
+    indexes = """
+        CREATE INDEX IF NOT EXISTS triples_po ON triples (p, o);
+        CREATE INDEX IF NOT EXISTS triples_o ON triples (o);
+    """
+
+    def __init__(self, path, batch=100000, create=False):
+        super().__init__()
+        self.path = path
+        self.batch = batch
+        self.pending = []
+        self.prefixes = {}
+        if create and os.path.exists(path):
+            os.remove(path)
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        # the database is a build artifact, it is written again if a build fails
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.conn.execute("PRAGMA journal_mode = MEMORY")
+        self.conn.executescript(self.schema)
+        self.conn.execute("CREATE TEMP TABLE pending (s TEXT, p TEXT, o TEXT)")
+        # counted on first use, counting a large database takes a while
+        self.size = 0 if create else None
+
+    def add(self, triple, context=None, quoted=False):
+        self.add_encoded(tuple(encode(t) for t in triple))
+
+    def add_encoded(self, terms):
+        """Add a triple of terms in N-Triples syntax, e.g. as read by binary.stream_triples()."""
+        self.pending.append(terms)
+        if len(self.pending) >= self.batch:
+            self.commit()
+
+    def addN(self, quads):
+        for s, p, o, _ in quads:
+            self.add((s, p, o))
+
+    def commit(self):
+        """Write the buffered triples in one transaction."""
+        if not self.pending:
+            return
+        conn = self.conn
+        conn.execute("BEGIN")
+        conn.executemany("INSERT INTO pending VALUES (?, ?, ?)", self.pending)
+        conn.execute("""INSERT OR IGNORE INTO terms (term)
+                        SELECT s FROM pending UNION ALL SELECT p FROM pending UNION ALL SELECT o FROM pending""")
+        inserted = conn.execute("""INSERT OR IGNORE INTO triples
+                                   SELECT s.id, p.id, o.id FROM pending
+                                   JOIN terms s ON s.term = pending.s
+                                   JOIN terms p ON p.term = pending.p
+                                   JOIN terms o ON o.term = pending.o""").rowcount
+        conn.execute("DELETE FROM pending")
+        conn.execute("COMMIT")
+        if self.size is not None:
+            self.size += inserted
+        self.pending = []
+
+    def rollback(self):
+        self.pending = []
+
+    def close(self, commit_pending_transaction=True):
+        if commit_pending_transaction:
+            self.commit()
+        # indexes are faster to create after the bulk insert
+        self.conn.executescript(self.indexes)
+        self.conn.close()
+
+    def term_id(self, term):
+        row = self.conn.execute("SELECT id FROM terms WHERE term = ?", (encode(term),)).fetchone()
+        return row[0] if row else None
+
+    def where(self, pattern):
+        """SQL condition and parameters for a (s, p, o) pattern, None if a term of it is not in the store."""
+        conditions, parameters = [], []
+        for column, term in zip("spo", pattern):
+            if term is None:
+                continue
+            term_id = self.term_id(term)
+            if term_id is None:
+                return None
+            conditions.append("t.{} = ?".format(column))
+            parameters.append(term_id)
+        return " AND ".join(conditions) or "1", parameters
+
+    def triples(self, triple_pattern, context=None):
+        self.commit()
+        where = self.where(triple_pattern)
+        if where is None:
+            return
+        rows = self.conn.execute("""SELECT s.term, p.term, o.term FROM triples t
+                                    JOIN terms s ON s.id = t.s JOIN terms p ON p.id = t.p JOIN terms o ON o.id = t.o
+                                    WHERE {}""".format(where[0]), where[1])
+        for row in rows:
+            yield tuple(decode_term(term) for term in row), iter(())
+
+    def remove(self, triple_pattern, context=None):
+        self.commit()
+        where = self.where(triple_pattern)
+        if where is None:
+            return
+        self.conn.execute("BEGIN")
+        removed = self.conn.execute("DELETE FROM triples AS t WHERE {}".format(where[0]), where[1]).rowcount
+        self.conn.execute("COMMIT")
+        if self.size is not None:
+            self.size -= removed
+
+    def __len__(self, context=None):
+        self.commit()
+        if self.size is None:
+            self.size = self.conn.execute("SELECT count(*) FROM triples").fetchone()[0]
+        return self.size
+
+    def subjects(self):
+        """Distinct subjects of the store, without reading all triples into memory."""
+        self.commit()
+        rows = self.conn.execute("SELECT term FROM terms WHERE id IN (SELECT DISTINCT s FROM triples) ORDER BY id")
+        for (term,) in rows:
+            yield decode_term(term)
+
+    def mentions(self, class_ref=None, ident_ref=None, limit=None):
+        """Mentions with the given its:taClassRef and/or its:taIdentRef (e.g. URIRef("sms:Application")), 
+        as (mention, anchor, sentence) tuples. The anchor is None in compact graphs."""
+        self.commit()
+        conditions, parameters = [], []
+        for predicate, term in [(its_taClassRef, class_ref), (its_taIdentRef, ident_ref)]:
+            if term is None:
+                continue
+            ids = [self.term_id(predicate), self.term_id(term)]
+            if None in ids:
+                return []
+            conditions.append("SELECT s FROM triples WHERE p = ? AND o = ?")
+            parameters += ids
+        if not conditions:
+            raise ValueError("class_ref or ident_ref is needed")
+        anchor_of, reference_context = self.term_id(nif_anchorOf), self.term_id(nif_referenceContext)
+        rows = self.conn.execute("""SELECT mention.term, anchor.term, sentence.term FROM ({}) m
+                                    JOIN terms mention ON mention.id = m.s
+                                    LEFT JOIN triples a ON a.s = m.s AND a.p = ? LEFT JOIN terms anchor ON anchor.id = a.o
+                                    LEFT JOIN triples c ON c.s = m.s AND c.p = ? LEFT JOIN terms sentence ON sentence.id = c.o
+                                    ORDER BY m.s LIMIT ?""".format(" INTERSECT ".join(conditions)),
+                                 parameters + [anchor_of, reference_context, -1 if limit is None else limit])
+        return [tuple(None if term is None else decode_term(term) for term in row) for row in rows]
+
+    def link_counts(self, class_ref=None, limit=None):
+        """(its:taIdentRef, number of mentions) of all mentions or of those with class_ref, most frequent first."""
+        self.commit()
+        ident_ref = self.term_id(its_taIdentRef)
+        if ident_ref is None:
+            return []
+        condition, parameters = "", [ident_ref]
+        if class_ref is not None:
+            ids = [self.term_id(its_taClassRef), self.term_id(class_ref)]
+            if None in ids:
+                return []
+            condition = "AND l.s IN (SELECT s FROM triples WHERE p = ? AND o = ?)"
+            parameters += ids
+        rows = self.conn.execute("""SELECT link.term, count(*) AS n FROM triples l JOIN terms link ON link.id = l.o
+                                    WHERE l.p = ? {} GROUP BY l.o ORDER BY n DESC, link.term LIMIT ?""".format(condition),
+                                 parameters + [-1 if limit is None else limit])
+        return [(decode_term(term), n) for term, n in rows]
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    def bind(self, prefix, namespace):
+        self.prefixes[prefix] = namespace
+
+    def namespace(self, prefix):
+        return self.prefixes.get(prefix)
+
+    def prefix(self, namespace):
+        for prefix, ns in self.prefixes.items():
+            if ns == namespace:
+                return prefix
+        return None
+
+    def namespaces(self):
+        return iter(self.prefixes.items())
+
+
+def serialize_jsonld(g, destination):
+    """Write a graph on a TripleStore as compacted JSON-LD, one subject at a time.
+
+    rdflib's serializer builds the whole document in memory first. Here every
+    node object is written as soon as it is converted, the output is the same
+    graph (with one node object per line instead of an indented document).
+    """
+    from rdflib_jsonld.context import Context
+    from rdflib_jsonld.serializer import Converter
+
+    jsonld_context = Context(context)
+    converter = Converter(jsonld_context, use_native_types=False, use_rdf_type=False)
+    with open(destination, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write('{{\n  "@context": {},\n  "{}": [\n'.format(json.dumps(context, ensure_ascii=False), jsonld_context.graph_key))
+        separator = "    "
+        for s in g.store.subjects():
+            # blank nodes that are referenced are embedded by their referrers
+            if isinstance(s, BNode) and any(g.subjects(None, s)):
+                continue
+            nodes = {}
+            converter.process_subject(g, s, nodes)
+            for node in nodes.values():
+                f.write(separator + json.dumps(node, sort_keys=True, ensure_ascii=False))
+                separator = ",\n    "
+        f.write("\n  ]\n}\n")
+
+def load(source, path, batch=100000):
+    """Load a built graph into a new database at path, returns the number of triples.
+
+    N-Triples/N-Quads (graph names are dropped) are streamed line by line without 
+    parsing their terms, JSON-LD is parsed into memory first.
+    """
+    store = TripleStore(path, batch=batch, create=True)
+    if source.endswith(".jsonld"):
+        g = Graph()
+        g.parse(source, format="json-ld")
+        for triple in g:
+            store.add(triple)
+    else:
+        for terms in stream_triples(source):
+            store.add_encoded(terms)
+    n_triples = len(store)
+    store.close()
+    return n_triples
+
+def disk_graph(path, batch=100000):
+    """Empty Graph on a new TripleStore at path."""
+    return Graph(store=TripleStore(path, batch=batch, create=True))
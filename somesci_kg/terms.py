@@ -0,0 +1,49 @@
+"""rdflib terms of the vocabulary, built once instead of for every triple.
+
+The mapping tables are turned into terms here as well, and repeated values
+(offsets, mention strings, links) are interned, so that identical terms share
+one object in graphs, fragments and caches.
+"""
+from functools import lru_cache
+
+from rdflib import URIRef, Literal
+from rdflib.namespace import RDF
+
+from .mappings import entity_map, phrase_map, relation_map, inv_relation_map
+
+
+rdf_type = RDF.type
+
+nif_Context = URIRef("nif:Context")
+nif_Sentence = URIRef("nif:Sentence")
+nif_OffsetBasedString = URIRef("nif:OffsetBasedString")
+nif_Section = URIRef("nif:Section")
+nif_broaderContext = URIRef("nif:broaderContext")
+nif_referenceContext = URIRef("nif:referenceContext")
+nif_superString = URIRef("nif:superString")
+nif_isString = URIRef("nif:isString")
+nif_anchorOf = URIRef("nif:anchorOf")
+nif_beginIndex = URIRef("nif:beginIndex")
+nif_endIndex = URIRef("nif:endIndex")
+its_taClassRef = URIRef("its:taClassRef")
+its_taIdentRef = URIRef("its:taIdentRef")
+schema_isPartOf = URIRef("schema:isPartOf")
+schema_hasPart = URIRef("schema:hasPart")
+dcterms_title = URIRef("dcterms:title")
+
+# annotation labels to their classes and relation labels to their predicates
+entity_classes = {label : tuple(URIRef(c) for c in classes) for label, classes in entity_map.items()}
+phrase_classes = {label : URIRef(c) for label, c in phrase_map.items()}
+relation_predicates = {label : URIRef(p) for label, p in relation_map.items()}
+inv_relation_predicates = {label : URIRef(p) for label, p in inv_relation_map.items()}
+
+
+@lru_cache(maxsize=1 << 16)
+def iri(value):
+    """Interned URIRef for values that recur across documents, e.g. links."""
+    return URIRef(value)
+
+@lru_cache(maxsize=1 << 16, typed=True)
+def literal(value):
+    """Interned Literal for short recurring values, e.g. offsets and mention strings."""
+    return Literal(value)
@@ -0,0 +1,51 @@
+"""Strings of sentences and mentions, reconstructed from the offsets in a (compact) graph."""
+from rdflib import URIRef
+
+from .writers import expand_iri
+
+
+nif_isString = URIRef(expand_iri("nif:isString"))
+nif_anchorOf = URIRef(expand_iri("nif:anchorOf"))
+nif_referenceContext = URIRef(expand_iri("nif:referenceContext"))
+nif_beginIndex = URIRef(expand_iri("nif:beginIndex"))
+nif_endIndex = URIRef(expand_iri("nif:endIndex"))
+
+
+class TextResolver:
+    """Resolves the string of a node of a parsed graph.
+
+    Contexts carry their string (nif:isString) and mentions of a full graph their
+    anchor (nif:anchorOf). In a compact graph (build --compact) sentences and
+    mentions only have begin and end offsets into their nif:referenceContext,
+    the string is cut out of it on demand. Strings of contexts are kept, so
+    resolving the sentences and mentions of one document reads its text once.
+
+        g = Graph()
+        g.parse("somesci.jsonld", format="json-ld")
+        text = TextResolver(g)
+        text.string(URIRef("http://data.gesis.org/somesci/PMC123/sentence4/T1"))
+    """
+    def __init__(self, g):
+        self.g = g
+        self.contexts = {}
+
+    def string(self, node):
+        """String of a context, sentence, section or mention, None if it can not be resolved."""
+        if node in self.contexts:
+            return self.contexts[node]
+        text = self.g.value(node, nif_isString)
+        if text is not None:
+            self.contexts[node] = str(text)
+            return self.contexts[node]
+        anchor = self.g.value(node, nif_anchorOf)
+        if anchor is not None:
+            return str(anchor)
+        context = self.g.value(node, nif_referenceContext)
+        begin = self.g.value(node, nif_beginIndex)
+        end = self.g.value(node, nif_endIndex)
+        if context is None or begin is None or end is None:
+            return None
+        text = self.string(context)
+        if text is None:
+            return None
+        return text[int(begin):int(end)]
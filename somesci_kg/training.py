@@ -0,0 +1,127 @@
+"""NER/RE training data, exported from the annotations while the graph is built.
+
+Every sentence becomes one JSON line: its tokens with BIO tags of the entity labels,
+the entities with their token spans and the relations between entities of the
+sentence. The lines are written per subset to gzip compressed shards
+<folder>/<subset>/part-00000.jsonl.gz, ... of at most shard_size sentences.
+"""
+import glob
+import gzip
+import io
+import json
+import os
+import re
+
+from .diagnostics import Collector
+from .mappings import phrase_map, relation_map
+
+
+token_pattern = re.compile(r"\w+|[^\w\s]")
+
+
+def tokenize(text):
+    """Tokens of a sentence with their character offsets: words and single punctuation characters."""
+    return [(m.group(), m.start(), m.end()) for m in token_pattern.finditer(text)]
+
+def token_span(tokens, begin, end):
+    """First and last (exclusive) token overlapping the characters begin..end, None if there is none."""
+    first = next((i for i, (_, _, tok_end) in enumerate(tokens) if tok_end > begin), len(tokens))
+    last = first
+    while last < len(tokens) and tokens[last][1] < end:
+        last += 1
+    return (first, last) if last > first else None
+
+def sentence_record(doi, sent_idx, sent):
+    """Tokens, BIO tags and entities of a sentence, nested entities are listed but not tagged."""
+    tokens = tokenize(sent['string'])
+    tags = ["O"] * len(tokens)
+    entities = []
+    for eid, entity in sorted(sent['entities'].items(), key=lambda e: (e[1]['beg'], e[1]['beg'] - e[1]['end'])):
+        if entity['label'] not in phrase_map:
+            continue
+        span = token_span(tokens, entity['beg'], entity['end'])
+        if span is None:
+            continue
+        entities.append({'id' : eid, 'label' : entity['label'], 'string' : entity['string'], 'tokens' : list(span)})
+        first, last = span
+        # BIO can not express overlaps, the outer (first and longer) entity is tagged
+        if all(tag == "O" for tag in tags[first:last]):
+            tags[first] = "B-" + entity['label']
+            for i in range(first + 1, last):
+                tags[i] = "I-" + entity['label']
+    return {'document' : doi, 'sentence' : sent_idx, 'tokens' : [t for t, _, _ in tokens], 'tags' : tags,
+            'entities' : entities, 'relations' : []}
+
+def document_records(doi, sentences, relations):
+    """Records of the non-empty sentences of a document with the relations within them."""
+    records = {}
+    sentence_of = {}
+    for sent_idx, sent in enumerate(sentences):
+        if not sent['string'].strip():
+            continue
+        records[sent_idx] = sentence_record(doi, sent_idx, sent)
+        for eid in sent['entities']:
+            sentence_of[eid] = sent_idx
+    for rid, relation in relations.items():
+        if relation['label'] not in relation_map:
+            continue
+        # relations across sentences can not be learned from single sentences
+        sent_idx = sentence_of.get(relation['arg1'])
+        if sent_idx is None or sent_idx != sentence_of.get(relation['arg2']):
+            continue
+        records[sent_idx]['relations'].append({'id' : rid, 'label' : relation['label'],
+                                               'head' : relation['arg1'], 'tail' : relation['arg2']})
+    return list(records.values())
+
+
+class TrainingExport(Collector):
+    """Writes the training records of the converted documents, if opened with a folder."""
+    def __init__(self):
+        super().__init__()
+        self.folder = None
+        self.shard_size = 10000
+        self.shards = {}
+
+    @property
+    def enabled(self):
+        return self.folder is not None
+
+    def open(self, folder, shard_size=10000):
+        self.folder = folder
+        self.shard_size = shard_size
+
+    def add_document(self, sub_dataset, doi, sentences, relations):
+        if self.enabled:
+            self.emit(str(sub_dataset), document_records(doi, sentences, relations))
+
+    def output(self, subset, records):
+        for record in records:
+            self.write(subset, record)
+
+    def write(self, subset, record):
+        if subset not in self.shards:
+            # shards of an earlier export of the subset are replaced
+            for part in glob.glob(os.path.join(self.folder, subset, "part-*.jsonl.gz")):
+                os.remove(part)
+            self.shards[subset] = [None, 0, 0]
+        shard = self.shards[subset]
+        f, number, n = shard
+        if f is None or n >= self.shard_size:
+            if f is not None:
+                f.close()
+                number += 1
+            path = os.path.join(self.folder, subset, "part-{:05d}.jsonl.gz".format(number))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # no time stamp in the gzip header, so that the shards are reproducible
+            f = io.TextIOWrapper(gzip.GzipFile(path, 'wb', mtime=0), encoding='utf-8')
+            n = 0
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        shard[:] = [f, number, n + 1]
+
+    def close(self):
+        for f, _, _ in self.shards.values():
+            if f is not None:
+                f.close()
+        self.shards = {}
+
+training = TrainingExport()
@@ -0,0 +1,176 @@
+"""Consistency checks of a built graph, run in parallel over partitions of its documents.
+
+Checks:
+    anchor          nif:anchorOf equals the substring of the nif:isString of its
+                    nif:referenceContext between nif:beginIndex and nif:endIndex
+    inverse         every sms:refersTo has the inverse sms:referredToBy* triple
+    refers_to       every sms:referredToBy* has the inverse sms:refersTo triple
+    link            every mention of a label in link_entities has an its:taIdentRef
+
+The graph is streamed from N-Triples/N-Quads (JSON-LD is parsed and written as
+N-Triples first) and its lines are distributed by document (the first path segment
+of the subject IRI) over temporary partition files, which are checked by worker
+processes. All checks only relate triples of the same document, so no partition
+needs another one.
+"""
+from collections import defaultdict
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import zlib
+
+from rdflib import Graph, URIRef
+
+from .binary import decode, nt_token
+from .mappings import context, entity_map, link_entities
+from .writers import TripleWriter, nt_term
+
+
+def nt_iri(name):
+    return nt_term(URIRef(name))
+
+anchor_of = nt_iri("nif:anchorOf")
+is_string = nt_iri("nif:isString")
+reference_context = nt_iri("nif:referenceContext")
+begin_index = nt_iri("nif:beginIndex")
+end_index = nt_iri("nif:endIndex")
+class_ref = nt_iri("its:taClassRef")
+ident_ref = nt_iri("its:taIdentRef")
+refers_to = nt_iri("sms:refersTo")
+referred_to_by = nt_iri("sms:referredToBy")[:-1]
+
+# class sets of the labels that are to be linked
+linked_classes = {frozenset(nt_iri(c) for c in entity_map[label]) : label for label in link_entities}
+
+base = "<" + context['@base']
+
+
+def document_of(subject):
+    """Document key of a subject IRI in N-Triples syntax, e.g. PMC123 for <.../somesci/PMC123/sentence0/T1>."""
+    if not subject.startswith(base):
+        return subject
+    return subject[len(base):].split('/', 1)[0].rstrip('>')
+
+def partition_graph(source, folder, partitions):
+    """Distribute the lines of an N-Triples/N-Quads file over partition files by document."""
+    files = [open(os.path.join(folder, "{}.nt".format(i)), 'w', encoding='utf-8', buffering=1 << 20) for i in range(partitions)]
+    n = 0
+    with open(source, 'r', encoding='utf-8') as f:
+        for line in f:
+            subject = line.split(' ', 1)[0]
+            files[zlib.crc32(document_of(subject).encode()) % partitions].write(line)
+            n += 1
+    for f in files:
+        f.close()
+    return [f.name for f in files], n
+
+def check_partition(filename, samples=10):
+    """Failure counts and examples of the checks in one partition file."""
+    strings = {}
+    anchors = set()
+    contexts = {}
+    begins = {}
+    ends = {}
+    classes = defaultdict(set)
+    linked = set()
+    refers = set()
+    referred = {}
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            terms = nt_token.findall(line)
+            if len(terms) < 3:
+                continue
+            s, p, o = terms[:3]
+            if p == anchor_of:
+                anchors.add((s, o))
+            elif p == is_string:
+                strings[s] = o
+            elif p == reference_context:
+                contexts[s] = o
+            elif p == begin_index:
+                begins[s] = o
+            elif p == end_index:
+                ends[s] = o
+            elif p == class_ref:
+                classes[s].add(o)
+            elif p == ident_ref:
+                linked.add(s)
+            elif p == refers_to:
+                refers.add((s, o))
+            elif p.startswith(referred_to_by):
+                referred[(o, s)] = p
+
+    failures = defaultdict(list)
+    checked = defaultdict(int)
+    for node, anchor in sorted(anchors):
+        checked['anchor'] += 1
+        context = contexts.get(node)
+        if context not in strings or node not in begins or node not in ends:
+            failures['anchor'].append({'node' : node, 'message' : "no context string or offsets"})
+            continue
+        begin, end = int(decode(begins[node])), int(decode(ends[node]))
+        expected = str(decode(strings[context]))[begin:end]
+        if str(decode(anchor)) != expected:
+            failures['anchor'].append({'node' : node, 'message' : "anchor {} but {}..{} of the context is {}".format(
+                anchor, begin, end, json.dumps(expected, ensure_ascii=False))})
+    for info, software in sorted(refers):
+        checked['inverse'] += 1
+        if (info, software) not in referred:
+            failures['inverse'].append({'node' : info, 'message' : "refersTo {} without inverse".format(software)})
+    for (info, software), predicate in referred.items():
+        checked['refers_to'] += 1
+        if (info, software) not in refers:
+            failures['refers_to'].append({'node' : software, 'message' : "{} {} without refersTo".format(predicate, info)})
+    for node, node_classes in classes.items():
+        label = linked_classes.get(frozenset(node_classes))
+        if label is None:
+            continue
+        checked['link'] += 1
+        if node not in linked:
+            failures['link'].append({'node' : node, 'message' : "{} mention without taIdentRef".format(label)})
+    return dict(checked), {check : len(f) for check, f in failures.items()}, {check : f[:samples] for check, f in failures.items()}
+
+def verify(source, workers=1, partitions=32, samples=10, tmp_dir=None):
+    """Check the graph in an N-Triples/N-Quads or JSON-LD file, returns the report as a dict.
+
+    The report does not depend on the number of workers, only on the number of partitions.
+    """
+    folder = tempfile.mkdtemp(prefix="somesci-verify-", dir=tmp_dir)
+    try:
+        lines = source
+        if source.endswith(".jsonld"):
+            g = Graph()
+            g.parse(source, format="json-ld")
+            lines = os.path.join(folder, "graph.nt")
+            writer = TripleWriter(lines)
+            for triple in g:
+                writer.add(triple)
+            writer.close()
+            del g
+        files, n_triples = partition_graph(lines, folder, partitions)
+        if workers <= 1:
+            results = [check_partition(filename, samples) for filename in files]
+        else:
+            with multiprocessing.get_context("fork").Pool(workers) as pool:
+                results = pool.starmap(check_partition, [(filename, samples) for filename in files])
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    report = {'source' : source, 'triples' : n_triples, 'checked' : defaultdict(int), 'failures' : defaultdict(int), 'samples' : defaultdict(list)}
+    for checked, failures, examples in results:
+        for check, n in checked.items():
+            report['checked'][check] += n
+        for check, n in failures.items():
+            report['failures'][check] += n
+        for check, f in examples.items():
+            report['samples'][check] += f[:samples - len(report['samples'][check])]
+    return report
+
+def summary(report):
+    print("Verified {} triples of {}".format(report['triples'], report['source']))
+    for check in ['anchor', 'inverse', 'refers_to', 'link']:
+        print("  {}: {} of {} failed".format(check, report['failures'].get(check, 0), report['checked'].get(check, 0)))
+        for example in report['samples'].get(check, [])[:3]:
+            print("    e.g. {} {}".format(example['node'], example['message']))
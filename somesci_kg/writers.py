@@ -0,0 +1,102 @@
+"""Streaming N-Triples/N-Quads output."""
+import json
+from urllib.parse import urljoin
+
+from rdflib import BNode, ConjunctiveGraph, Literal
+
+from .mappings import context
+from .metadata import new_graph
+
+
+def expand_iri(iri):
+    """Resolve compact (nif:Context) and relative (PMC123/sentence0) IRIs like the JSON-LD context does."""
+    prefix, sep, name = iri.partition(':')
+    if not sep:
+        return urljoin(context['@base'], iri)
+    if prefix in context and not prefix.startswith('@'):
+        return context[prefix] + name
+    return iri
+
+def nt_term(term):
+    if isinstance(term, Literal):
+        quoted = '"{}"'.format(term.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\r', '\\r'))
+        if term.language:
+            return "{}@{}".format(quoted, term.language)
+        if term.datatype:
+            return "{}^^<{}>".format(quoted, expand_iri(term.datatype))
+        return quoted
+    return "<{}>".format(expand_iri(term))
+
+class TripleWriter:
+    """Writes triples to disk as they are added instead of keeping them in a Graph.
+
+    Produces N-Triples, or N-Quads where triples added through named_graph() 
+    are put into that named graph. Duplicate triples are not filtered, 
+    RDF stores treat them as one.
+    """
+    def __init__(self, destination, quads=False):
+        self.quads = quads
+        self.count = 0
+        self.file = open(destination, 'w', encoding='utf-8', buffering=1 << 20)
+
+    def add(self, triple, graph=None):
+        line = " ".join(nt_term(t) for t in triple)
+        if self.quads and graph is not None:
+            line += " " + nt_term(graph)
+        self.file.write(line + " .\n")
+        self.count += 1
+
+    def named_graph(self, graph):
+        return NamedGraphWriter(self, graph)
+
+    def close(self):
+        self.file.close()
+
+class NamedGraphWriter:
+    def __init__(self, writer, graph):
+        self.writer = writer
+        self.graph = graph
+
+    def add(self, triple):
+        self.writer.add(triple, self.graph)
+
+def jsonld_data(g):
+    """Compacted JSON-LD object of g, as rdflib's serializer builds it, but with the nodes in subject order.
+
+    rdflib's serializer lists the nodes in the order of a set of the subjects, which 
+    depends on the string hashes that Python randomizes per process.
+    """
+    from rdflib_jsonld.context import Context
+    from rdflib_jsonld.serializer import Converter
+
+    jsonld_context = Context(context)
+    converter = Converter(jsonld_context, use_native_types=False, use_rdf_type=False)
+    nodes = {}
+    for s in sorted(set(g.subjects())):
+        # blank nodes that are referenced are embedded by their referrers
+        if isinstance(s, BNode) and any(g.subjects(None, s)):
+            continue
+        converter.process_subject(g, s, nodes)
+    nodes = list(nodes.values())
+    data = dict(nodes[0]) if len(nodes) == 1 else {jsonld_context.graph_key : nodes}
+    data["@context"] = context
+    return data
+
+def write_jsonld(g, destination):
+    """Write g as compacted JSON-LD, laid out like rdflib's serializer does, see jsonld_data()."""
+    data = json.dumps(jsonld_data(g), indent=2, separators=(",", ": "), sort_keys=True, ensure_ascii=False)
+    with open(destination, 'wb') as f:
+        f.write(data.encode('utf-8', 'replace'))
+
+def jsonld_from_stream(source, destination, quads=False):
+    """Optional post-processing step: serialize streamed N-Triples/N-Quads output as compacted JSON-LD."""
+    if quads:
+        cg = ConjunctiveGraph()
+        cg.parse(source, format="nquads")
+        streamed = new_graph()
+        for triple in cg.triples((None, None, None)):
+            streamed.add(triple)
+    else:
+        streamed = new_graph()
+        streamed.parse(source, format="nt")
+    write_jsonld(streamed, destination)